@@ -1,6 +1,8 @@
 import re
 from datetime import datetime
 
+from common.sources import SOURCES, to_records
+
 
 # ---------------------------------------------------------------------------
 # Filter keyword lists
@@ -182,6 +184,20 @@ def _first_sentence(text):
 # Public API
 # ---------------------------------------------------------------------------
 
+def build_all_products(collected):
+    """
+    Flatten raw collector output into the per-source product lists used here.
+
+    Input:  dict keyed by each source's key (see common/sources.py)
+            (toolify may be the raw {"new", "trending"} dict or a flat list)
+    Output: dict keyed by each source's indie_key, in registry order
+    """
+    return {
+        source["indie_key"]: to_records(source, collected.get(source["key"])) or []
+        for source in SOURCES
+    }
+
+
 def filter_unsuitable_products(all_products):
     """
     Filter products unsuitable for indie hackers.
@@ -655,34 +671,14 @@ def deep_analyze_product(product, rank):
     return "\n".join(lines)
 
 
-def generate_indie_report(
-    product_hunt_data,
-    toolify_data,
-    ai_tools_data,
-    chrome_extensions_data,
-    github_data,
-    hn_data,
-):
+def generate_indie_report(collected):
     """
     Generate a full indie hacker opportunity report in markdown.
 
+    collected: dict keyed by source key (see common/sources.py).
     Returns a complete markdown string.
     """
-    if isinstance(toolify_data, dict):
-        toolify_list = toolify_data.get("new", []) + toolify_data.get("trending", [])
-    elif isinstance(toolify_data, list):
-        toolify_list = toolify_data
-    else:
-        toolify_list = []
-
-    all_products = {
-        "product_hunt": product_hunt_data or [],
-        "toolify": toolify_list,
-        "ai_tools": ai_tools_data or [],
-        "chrome_extensions": chrome_extensions_data or [],
-        "github": github_data or [],
-        "hackernews": hn_data or [],
-    }
+    all_products = build_all_products(collected)
 
     suitable, filtered_out = filter_unsuitable_products(all_products)
 
@@ -698,7 +694,7 @@ def generate_indie_report(
     sections = [
         f"# Indie Hacker Opportunity Report — {today}",
         "",
-        f"Analysed **{total_input}** products across 6 sources. "
+        f"Analysed **{total_input}** products across {len(all_products)} sources. "
         f"**{len(suitable)}** passed the indie filter; **{len(filtered_out)}** were removed.",
         "",
     ]
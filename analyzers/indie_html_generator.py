@@ -5,6 +5,7 @@ from datetime import datetime
 from zoneinfo import ZoneInfo
 
 from analyzers.indie_analyzer import (
+    build_all_products,
     filter_unsuitable_products,
     score_product,
     deep_analyze_product,
@@ -435,15 +436,15 @@ _JS = """
 # Main generator
 # ---------------------------------------------------------------------------
 
-def generate_indie_html(indie_report_markdown, product_data):
+def generate_indie_html(indie_report_markdown, collected):
     """
     Generate a dark-theme HTML page for the indie opportunity report.
 
     Args:
         indie_report_markdown: str — the markdown from generate_indie_report()
                                      (used only for reference; HTML is built from data)
-        product_data: dict with keys matching generate_indie_report() parameters:
-            product_hunt, toolify, ai_tools, chrome_extensions, github, hackernews
+        collected: dict keyed by source key (see common/sources.py),
+                   the same input as generate_indie_report()
 
     Returns:
         str: Complete HTML document
@@ -454,20 +455,7 @@ def generate_indie_html(indie_report_markdown, product_data):
     date_str = now.strftime(f"%B %d, %Y · %H:%M {tz_abbr}")
 
     # ── Re-run analysis (same logic as generate_indie_report) ─────────────
-    toolify_raw = product_data.get("toolify", [])
-    if isinstance(toolify_raw, dict):
-        toolify_list = toolify_raw.get("new", []) + toolify_raw.get("trending", [])
-    else:
-        toolify_list = toolify_raw or []
-
-    all_products = {
-        "product_hunt":     product_data.get("product_hunt", []),
-        "toolify":          toolify_list,
-        "ai_tools":         product_data.get("ai_tools", []),
-        "chrome_extensions": product_data.get("chrome_extensions", []),
-        "github":           product_data.get("github", []),
-        "hackernews":       product_data.get("hackernews", []),
-    }
+    all_products = build_all_products(collected)
 
     suitable, filtered_out = filter_unsuitable_products(all_products)
     for p in suitable:
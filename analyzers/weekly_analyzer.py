@@ -1,34 +1,17 @@
 """周报数据分析器"""
 
-import re
 from collections import defaultdict
 from datetime import datetime, timedelta
 from pathlib import Path
 from zoneinfo import ZoneInfo
 
-from storage.data_store import load_daily_data, list_available_dates
+from common.keywords import extract_keywords
+from common.sources import SOURCE_KEYS, get_source
+from storage.data_store import load_daily_range
 
 
-# 停用词列表
-STOP_WORDS = {
-    "the", "a", "an", "for", "with", "and", "or", "to", "of", "in", "on", "at",
-    "is", "it", "be", "as", "by", "this", "that", "from", "your", "you", "we",
-    "our", "all", "any", "can", "has", "have", "will", "more", "most", "new",
-    "one", "two", "using", "use", "used", "into", "are", "was", "been", "being",
-    "their", "them", "they", "what", "when", "where", "which", "who", "how",
-    "just", "like", "make", "get", "also", "its", "about", "than", "then",
-    "only", "other", "such", "some", "each", "every", "but", "not", "no",
-}
-
-# 数据源名称映射
-SOURCE_NAMES = [
-    "product_hunt",
-    "toolify",
-    "ai_tools",
-    "chrome_extensions",
-    "github_trending",
-    "hacker_news",
-]
+# 数据源名称（来自 common/sources.py）
+SOURCE_NAMES = SOURCE_KEYS
 
 
 def load_weekly_data(days=7):
@@ -49,19 +32,17 @@ def load_weekly_data(days=7):
     pst = ZoneInfo("America/Los_Angeles")
     today = datetime.now(pst)
 
-    result = {
-        "dates": [],
-        "product_hunt": [],
-        "toolify": [],
-        "ai_tools": [],
-        "chrome_extensions": [],
-        "github_trending": [],
-        "hacker_news": [],
-    }
+    result = {"dates": []}
+    for source in SOURCE_NAMES:
+        result[source] = []
+
+    # 一次读取整个范围（清单中没有的日期不会被探测）
+    start = (today - timedelta(days=days - 1)).strftime("%Y-%m-%d")
+    loaded = load_daily_range(start, today.strftime("%Y-%m-%d"))
 
     for i in range(days):
         date = (today - timedelta(days=i)).strftime("%Y-%m-%d")
-        data = load_daily_data(date)
+        data = loaded.get(date)
 
         if data:
             result["dates"].append(date)
@@ -131,43 +112,6 @@ def analyze_frequency(items, key="name"):
     return result
 
 
-def extract_keywords(items, top_n=10):
-    """
-    从产品名称和描述中提取关键词
-
-    Args:
-        items: 产品列表
-        top_n: 返回前N个关键词
-
-    Returns:
-        list: [(keyword, count), ...]
-    """
-    word_count = defaultdict(int)
-
-    # 提取文本字段
-    text_fields = ["name", "title", "description", "tagline"]
-
-    for item in items:
-        text_parts = []
-        for field in text_fields:
-            if field in item and item[field]:
-                text_parts.append(str(item[field]))
-
-        text = " ".join(text_parts)
-
-        # 提取单词（只保留英文字母）
-        words = re.findall(r"\b[a-zA-Z]{3,}\b", text)
-
-        for word in words:
-            word_lower = word.lower()
-            if word_lower not in STOP_WORDS:
-                word_count[word_lower] += 1
-
-    # 排序并返回Top N
-    sorted_words = sorted(word_count.items(), key=lambda x: -x[1])
-    return sorted_words[:top_n]
-
-
 def generate_weekly_insights(days=7):
     """
     生成周报分析洞察
@@ -233,6 +177,4 @@ def generate_weekly_insights(days=7):
 
 def _get_name_key(source):
     """根据数据源返回用于匹配的字段名"""
-    if source == "hacker_news":
-        return "title"
-    return "name"
+    return get_source(source)["name_key"]
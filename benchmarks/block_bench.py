@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+"""资源拦截基准 - 同一组页面先不拦截、再拦截各加载一次，对比下载流量
+
+不拦截的一轮会把每个页面的下载字节数记录到 data/cache/page_baselines.json，
+之后日常采集（默认拦截）的日志按这个基线给出节省的流量。
+
+用法：
+    python -m benchmarks.block_bench             # Toolify 的两个页面
+    python -m benchmarks.block_bench URL [URL]   # 指定页面（不等待特定元素）
+"""
+
+import argparse
+
+from collectors.browser import fetch_pages_html, load_page_baselines
+from collectors.toolify import MAX_WAIT_SECONDS, NEW_URL, READY_SELECTORS, STATE_PATH, TRENDING_URL
+
+
+def main():
+    parser = argparse.ArgumentParser(description="资源拦截基准")
+    parser.add_argument("urls", nargs="*", help="页面地址，默认 Toolify 的 new 和 trending")
+    args = parser.parse_args()
+
+    urls = args.urls or [NEW_URL, TRENDING_URL]
+    ready_selectors = None if args.urls else READY_SELECTORS
+    options = {"max_wait": MAX_WAIT_SECONDS, "state_path": STATE_PATH}
+
+    print("不拦截（记录基线）:")
+    fetch_pages_html(urls, ready_selectors, block=False, **options)
+    print("拦截:")
+    fetch_pages_html(urls, ready_selectors, block=True, **options)
+
+    baselines = load_page_baselines()
+    missing = [url for url in urls if url not in baselines]
+    if missing:
+        print(f"以下页面未就绪，没有记录基线: {', '.join(missing)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""HTML 解析微基准 - 对比 html.parser 全量建树 与 lxml + SoupStrainer 局部解析
+
+用法：
+    python -m benchmarks.parse_bench                  # 使用合成页面
+    python -m benchmarks.parse_bench --cassette DIR   # 使用 main.py --record 录制的真实页面
+"""
+
+import argparse
+import time
+
+from bs4 import BeautifulSoup
+
+from collectors import cassette
+from collectors.github_trending import _parse_repos
+from collectors.theresanaiforthat import _parse_tools
+from collectors.toolify import NEW_URL, TRENDING_URL, _parse_new_tools, _parse_trending
+
+
+# (名称, 页面 URL, 旧实现使用的选择器, 新解析函数)
+CASES = [
+    ("github_trending", "https://github.com/trending", "article.Box-row", _parse_repos),
+    ("ai_tools", "https://theresanaiforthat.com/new/", ".li[data-name]", _parse_tools),
+    ("toolify_new", NEW_URL, ".tool-item", _parse_new_tools),
+    ("toolify_trending", TRENDING_URL, "tr.el-table__row", _parse_trending),
+]
+
+# 合成页面中与目标无关的填充内容（导航、脚本、图标等），模拟真实页面的体积
+_FILLER = (
+    '<div class="nav"><ul>' + "".join(f'<li><a href="/n{i}">Link {i}</a></li>' for i in range(40)) + "</ul></div>"
+    '<svg viewBox="0 0 16 16"><path d="M8 0C3.58 0 0 3.58 0 8c0 3.54 2.29 6.53 5.47 7.59"></path></svg>'
+    "<script>window.__DATA__ = {" + ",".join(f'"k{i}": {i}' for i in range(200)) + "};</script>"
+)
+
+
+def _synthetic_page(name, count=50):
+    """生成与真实页面结构相近的合成 HTML"""
+    if name == "github_trending":
+        items = "".join(
+            f'<article class="Box-row"><h2><a href="/owner{i}/repo{i}">owner{i} / repo{i}</a></h2>'
+            f"<p>Description of repository number {i}</p>"
+            f'<span class="d-inline-block float-sm-right">{i * 10} stars today</span></article>{_FILLER}'
+            for i in range(count)
+        )
+    elif name == "ai_tools":
+        items = "".join(
+            f'<div class="li" data-name="Tool {i}" data-task="Writing">'
+            f'<a class="ai_link" href="/ai/tool-{i}/">Tool {i}</a>'
+            f'<div class="short_desc">An AI tool that does useful thing number {i}</div></div>{_FILLER}'
+            for i in range(count)
+        )
+    elif name == "toolify_new":
+        items = "".join(
+            f'<div class="tool-item" data-handle="tool-{i}" data-advertisement_id="" data-position="AI">'
+            f'<a href="/tool/tool-{i}"><span class="tool-name">Tool {i}</span></a>'
+            f'<p class="tool-desc">A new AI tool number {i} for testing</p></div>{_FILLER}'
+            for i in range(count)
+        )
+    else:
+        items = "<table>" + "".join(
+            f'<tr class="el-table__row"><td>{i}</td><td><a class="go-tool" href="/tool/t{i}">Tool {i}</a></td>'
+            f"<td><span>{i}.5M</span></td><td>+1</td><td><span>{i}%</span></td>"
+            f'<td><p class="tool-desc">Trending tool {i}</p></td><td>AI</td></tr>'
+            for i in range(count)
+        ) + "</table>" + _FILLER * count
+    return f"<html><head><title>{name}</title></head><body>{_FILLER}{items}{_FILLER}</body></html>"
+
+
+def _load_page(name, url, cassette_dir):
+    """从 cassette 读取页面（浏览器页面优先，其次 HTTP 响应）"""
+    cassette.start_replay(cassette_dir)
+    try:
+        html = cassette.replay_page(url)
+        if not html:
+            try:
+                html = cassette.replay_response(url).text
+            except Exception:
+                html = ""
+    finally:
+        cassette.stop()
+    return html
+
+
+def _best_of(func, repeat):
+    """多次运行取最短耗时（秒）"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="HTML 解析微基准")
+    parser.add_argument("--cassette", metavar="DIR", help="使用录制的页面而不是合成页面")
+    parser.add_argument("--repeat", type=int, default=5, help="每项重复次数，取最短耗时")
+    args = parser.parse_args()
+
+    print(f"{'页面':<18}{'大小':>10}{'html.parser':>14}{'lxml+strainer':>16}{'加速':>8}")
+    for name, url, selector, parse in CASES:
+        html = _load_page(name, url, args.cassette) if args.cassette else _synthetic_page(name)
+        if not html:
+            print(f"{name:<18}{'(缺少页面)':>10}")
+            continue
+
+        before = _best_of(lambda: BeautifulSoup(html, "html.parser").select(selector), args.repeat)
+        after = _best_of(lambda: parse(html, 1000), args.repeat)
+        print(
+            f"{name:<18}{len(html) / 1024:>8.0f}KB"
+            f"{before * 1000:>12.1f}ms{after * 1000:>14.1f}ms{before / after:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
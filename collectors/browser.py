@@ -0,0 +1,377 @@
+"""Playwright 浏览器池 - 一次启动 Chromium，多个页面并行加载"""
+
+import json
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from urllib.parse import urlsplit
+
+from playwright.sync_api import sync_playwright, TimeoutError as PlaywrightTimeoutError
+
+from . import budget, cassette
+
+
+USER_AGENT = (
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
+    "AppleWebKit/537.36 (KHTML, like Gecko) "
+    "Chrome/120.0.0.0 Safari/537.36"
+)
+
+LAUNCH_ARGS = ["--no-sandbox", "--disable-blink-features=AutomationControlled"]
+
+# 隐藏 webdriver 标记，降低被 Cloudflare 识别的概率
+STEALTH_SCRIPT = "Object.defineProperty(navigator, 'webdriver', {get: () => undefined})"
+
+# Cloudflare 验证页特征
+CHALLENGE_TITLES = ("Just a moment", "Attention Required", "Checking your browser")
+CHALLENGE_SELECTOR = "#challenge-form, #challenge-running, #cf-challenge-running, iframe[src*='challenges.cloudflare.com']"
+
+# 只需要 DOM：拦截这些资源类型
+BLOCKED_RESOURCE_TYPES = {"image", "media", "font", "stylesheet"}
+
+# 第三方统计/广告域名（按后缀匹配），无论资源类型一律拦截
+BLOCKED_HOSTS = (
+    "google-analytics.com",
+    "googletagmanager.com",
+    "googlesyndication.com",
+    "doubleclick.net",
+    "adservice.google.com",
+    "facebook.net",
+    "connect.facebook.net",
+    "hotjar.com",
+    "clarity.ms",
+    "segment.io",
+    "mixpanel.com",
+    "intercom.io",
+    "crisp.chat",
+)
+
+# 永不拦截的域名（Cloudflare 验证依赖这些资源）
+ALLOWED_HOSTS = ("challenges.cloudflare.com",)
+
+# 不拦截时每个页面下载的字节数 {url: 字节数}，作为估算拦截节省流量的基线；
+# 由 block=False 的运行或 benchmarks/block_bench.py 记录
+PAGE_BASELINES_PATH = Path(__file__).parent.parent / "data" / "cache" / "page_baselines.json"
+
+
+# 存储状态文件的最长有效期（秒）：每日运行间隔 24 小时，留出余量；
+# 单个 cookie 是否过期另按其 expires 判断
+STATE_MAX_AGE = 36 * 3600
+
+
+def load_storage_state(path, max_age=STATE_MAX_AGE):
+    """
+    读取保存的 context 存储状态（cookies + localStorage）
+
+    Args:
+        path: 状态文件路径
+        max_age: 最长有效秒数，超过视为过期
+
+    Returns:
+        dict: Playwright storage_state，文件不存在、损坏或过期时返回None
+    """
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            saved = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    if time.time() - saved.get("saved_at", 0) > max_age:
+        return None
+
+    state = saved.get("state") or {}
+    # 去掉已过期的 cookie（expires 为 -1 表示会话 cookie）
+    now = time.time()
+    state["cookies"] = [
+        c for c in state.get("cookies", [])
+        if c.get("expires", -1) == -1 or c["expires"] > now
+    ]
+    return state
+
+
+def save_storage_state(context, path):
+    """保存 context 存储状态，写入失败不影响采集"""
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"saved_at": time.time(), "state": context.storage_state()}, f)
+        tmp_path.replace(path)
+    except Exception as e:
+        print(f"    保存浏览器状态失败: {e}")
+
+
+def touch_storage_state(path):
+    """
+    刷新状态文件的保存时间（cookies 经直接请求验证仍然有效时调用），写入失败不影响采集
+    """
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            saved = json.load(f)
+        saved["saved_at"] = time.time()
+        tmp_path = path.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(saved, f)
+        tmp_path.replace(path)
+    except (OSError, ValueError):
+        pass
+
+
+def cookies_for(state, host):
+    """从 storage_state 中取出适用于 host 的 cookies，供直接 HTTP 请求使用"""
+    cookies = {}
+    for c in (state or {}).get("cookies", []):
+        domain = c.get("domain", "").lstrip(".")
+        if host == domain or host.endswith("." + domain):
+            cookies[c["name"]] = c["value"]
+    return cookies
+
+
+@contextmanager
+def browser_context(storage_state=None):
+    """
+    启动一个 Chromium 并创建共享 context，退出时关闭全部资源
+
+    Args:
+        storage_state: 之前保存的存储状态，复用 Cloudflare 验证 cookie
+
+    Yields:
+        BrowserContext: 可在其中打开多个标签页
+    """
+    with sync_playwright() as p:
+        browser = p.chromium.launch(headless=True, args=LAUNCH_ARGS)
+        try:
+            context = browser.new_context(
+                user_agent=USER_AGENT,
+                viewport={"width": 1280, "height": 800},
+                storage_state=storage_state,
+            )
+            context.add_init_script(STEALTH_SCRIPT)
+            yield context
+        finally:
+            browser.close()
+
+
+def _host_matches(host, suffixes):
+    """host 等于某个后缀或是其子域名"""
+    return any(host == s or host.endswith("." + s) for s in suffixes)
+
+
+def load_page_baselines(path=PAGE_BASELINES_PATH):
+    """读取不拦截时的页面下载字节数 {url: 字节数}，不存在或损坏时返回空字典"""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_page_baselines(baselines, path=PAGE_BASELINES_PATH):
+    """保存页面基线，写入失败不影响采集"""
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(baselines, f, indent=2)
+        tmp_path.replace(path)
+    except OSError:
+        pass
+
+
+def block_resources(page, blocked_types=None, blocked_hosts=None, allowed_hosts=None):
+    """
+    拦截页面中不影响 DOM 的资源请求，并统计流量
+
+    Args:
+        page: Playwright Page
+        blocked_types: 拦截的资源类型，默认 BLOCKED_RESOURCE_TYPES
+        blocked_hosts: 拦截的域名后缀，默认 BLOCKED_HOSTS
+        allowed_hosts: 永不拦截的域名后缀，默认 ALLOWED_HOSTS
+
+    Returns:
+        dict: 实时更新的统计 {"blocked": 拦截请求数, "loaded": 完成请求数,
+              "loaded_bytes": 实际下载的响应体字节数}
+              被拦截的请求不会发出，节省的流量只能与不拦截时的基线对比得出。
+    """
+    blocked_types = BLOCKED_RESOURCE_TYPES if blocked_types is None else blocked_types
+    blocked_hosts = BLOCKED_HOSTS if blocked_hosts is None else blocked_hosts
+    allowed_hosts = ALLOWED_HOSTS if allowed_hosts is None else allowed_hosts
+    stats = {"blocked": 0, "loaded": 0, "loaded_bytes": 0}
+
+    def handle(route):
+        request = route.request
+        host = urlsplit(request.url).hostname or ""
+        if not _host_matches(host, allowed_hosts) and (
+            request.resource_type in blocked_types or _host_matches(host, blocked_hosts)
+        ):
+            stats["blocked"] += 1
+            route.abort()
+        else:
+            route.continue_()
+
+    def on_finished(request):
+        stats["loaded"] += 1
+        try:
+            stats["loaded_bytes"] += max(0, request.sizes()["responseBodySize"])
+        except Exception:
+            pass
+
+    if blocked_types or blocked_hosts:
+        page.route("**/*", handle)
+    page.on("requestfinished", on_finished)
+    return stats
+
+
+def _traffic_summary(page_stats, baseline=None):
+    """单个页面的流量日志；有不拦截时的基线才给出节省的流量"""
+    summary = (
+        f"拦截 {page_stats['blocked']} 个请求，"
+        f"下载 {page_stats['loaded']} 个请求 {page_stats['loaded_bytes'] / 1024:.0f} KB"
+    )
+    if baseline and page_stats["blocked"]:
+        saved = baseline - page_stats["loaded_bytes"]
+        summary += f"（不拦截时 {baseline / 1024:.0f} KB，节省 {saved / 1024:.0f} KB）"
+    return summary
+
+
+def _is_challenge(page):
+    """判断页面当前是否停留在 Cloudflare 验证页"""
+    try:
+        title = page.title()
+        if any(t in title for t in CHALLENGE_TITLES):
+            return True
+        return page.query_selector(CHALLENGE_SELECTOR) is not None
+    except Exception:
+        # 验证通过后页面跳转时执行上下文会被销毁，视为仍在验证中
+        return True
+
+
+def _is_ready(page, selector):
+    """页面已出现目标元素（未指定时为已通过验证）即视为就绪"""
+    if _is_challenge(page):
+        return False
+    if not selector:
+        return True
+    try:
+        return page.query_selector(selector) is not None
+    except Exception:
+        return False
+
+
+def wait_until_ready(pages, ready_selectors=None, max_wait=15, poll_interval=0.5):
+    """
+    轮询多个页面直到目标内容出现，取代固定 sleep
+
+    Args:
+        pages: {url: Page}
+        ready_selectors: {url: CSS 选择器}，出现即视为内容已加载
+        max_wait: 最长等待秒数
+        poll_interval: 轮询间隔秒数
+
+    Returns:
+        dict: {url: 就绪耗时秒数}，超时未就绪的页面为 None
+    """
+    ready_selectors = ready_selectors or {}
+    start = time.monotonic()
+    waited = {url: None for url in pages}
+    pending = set(pages)
+
+    while pending:
+        for url in list(pending):
+            if _is_ready(pages[url], ready_selectors.get(url)):
+                waited[url] = time.monotonic() - start
+                pending.discard(url)
+        if not pending or time.monotonic() - start >= max_wait:
+            break
+        time.sleep(poll_interval)
+
+    return waited
+
+
+def fetch_pages_html(urls, ready_selectors=None, max_wait=15, goto_timeout=30000,
+                     block=True, blocked_types=None, blocked_hosts=None, allowed_hosts=None,
+                     state_path=None):
+    """
+    在同一个浏览器的多个标签页中加载页面，等待目标内容出现后读取 HTML
+
+    每个标签页的导航只等到服务器开始响应（commit）就发起下一个，
+    多个页面的加载并行进行；之后统一轮询就绪状态：已就绪的页面不再等待，
+    仍在 Cloudflare 验证中的页面最多等待 max_wait 秒。
+
+    Args:
+        urls: 页面地址列表
+        ready_selectors: {url: CSS 选择器}，页面出现该元素即视为就绪
+        max_wait: 导航完成后等待内容就绪的最长秒数
+        goto_timeout: 单个页面开始响应的超时（毫秒）
+        block: 是否拦截图片/字体/样式/媒体和第三方统计请求
+        blocked_types: 拦截的资源类型，默认 BLOCKED_RESOURCE_TYPES
+        blocked_hosts: 拦截的域名后缀，默认 BLOCKED_HOSTS
+        allowed_hosts: 永不拦截的域名后缀，默认 ALLOWED_HOSTS
+        state_path: 存储状态文件，启动时加载、结束时保存，用于跳过重复验证
+
+    Returns:
+        dict: {url: html}，加载失败的页面为空字符串
+
+    设置了运行截止时间（budget）时，导航超时和就绪等待都不超过剩余时间。
+    """
+    if cassette.is_replaying():
+        return {url: cassette.replay_page(url) for url in urls}
+
+    results = {url: "" for url in urls}
+    if budget.exhausted():
+        print("    运行时间预算已用完，跳过浏览器")
+        return results
+    max_wait = budget.limit(max_wait)
+    goto_timeout = max(1, budget.limit(goto_timeout / 1000) * 1000)
+    stats = {}
+
+    try:
+        storage_state = load_storage_state(state_path) if state_path else None
+        with browser_context(storage_state) as context:
+            pages = {}
+            for url in urls:
+                page = context.new_page()
+                # 不拦截时也统计流量，作为之后拦截运行的基线
+                stats[url] = block_resources(
+                    page,
+                    blocked_types if block else (),
+                    blocked_hosts if block else (),
+                    allowed_hosts,
+                )
+                try:
+                    page.goto(url, timeout=goto_timeout, wait_until="commit")
+                    pages[url] = page
+                except PlaywrightTimeoutError as e:
+                    print(f"    页面加载超时: {url}: {e}")
+                    page.close()
+
+            waited = wait_until_ready(pages, ready_selectors, max_wait=max_wait)
+
+            for url, page in pages.items():
+                if waited[url] is None:
+                    print(f"    {max_wait}秒内未检测到页面内容，使用当前页面: {url}")
+                try:
+                    results[url] = page.content()
+                except Exception as e:
+                    print(f"    读取页面失败: {url}: {e}")
+
+            if state_path and any(w is not None for w in waited.values()):
+                save_storage_state(context, state_path)
+
+            baselines = load_page_baselines()
+            for url, page_stats in stats.items():
+                print(f"    {url}: {_traffic_summary(page_stats, baselines.get(url))}")
+            if not block:
+                # 只记录已就绪页面的流量，超时页面的下载量偏小
+                baselines.update(
+                    (url, stats[url]["loaded_bytes"]) for url in pages if waited[url] is not None
+                )
+                save_page_baselines(baselines)
+    except Exception as e:
+        print(f"    Playwright 错误: {e}")
+
+    if cassette.is_recording():
+        for url, html in results.items():
+            cassette.record_page(url, html)
+
+    return results
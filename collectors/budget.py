@@ -0,0 +1,51 @@
+"""运行时间预算 - 整次运行的截止时间，所有采集器的请求和浏览器等待都不会超过它
+
+用法：
+    budget.set_deadline(240)   # 从现在起 240 秒后截止
+
+设置后：
+    - collectors.http 把每个请求的超时缩短到剩余时间，预算用完时直接抛出 requests.Timeout
+    - collectors.browser 缩短导航超时和就绪等待，预算用完时不再启动浏览器
+    - runner.run_collectors 的每个任务截止时间不晚于整体截止时间
+未设置时不限制。
+"""
+
+import threading
+import time
+
+
+_state = {
+    "deadline": None,  # time.monotonic() 截止时间
+}
+_lock = threading.Lock()
+
+
+def set_deadline(seconds):
+    """设置从现在起 seconds 秒后的截止时间，None 表示取消"""
+    with _lock:
+        _state["deadline"] = None if seconds is None else time.monotonic() + seconds
+
+
+def clear():
+    """取消截止时间"""
+    set_deadline(None)
+
+
+def remaining():
+    """剩余秒数（不小于 0），未设置截止时间时返回 None"""
+    deadline = _state["deadline"]
+    if deadline is None:
+        return None
+    return max(0.0, deadline - time.monotonic())
+
+
+def limit(seconds):
+    """把超时/等待时长缩短到不超过剩余时间"""
+    left = remaining()
+    return seconds if left is None else min(seconds, left)
+
+
+def exhausted():
+    """预算是否已用完"""
+    left = remaining()
+    return left is not None and left <= 0
@@ -0,0 +1,132 @@
+"""录制/回放模式 - 把采集器看到的 HTTP 响应和浏览器页面 HTML 存进 cassette 目录
+
+录制：正常联网采集，同时把每个响应写入目录。
+回放：不联网、不启动浏览器，所有响应都从目录读取，结果可重复，便于离线基准测试。
+
+目录结构：
+    <dir>/http/<sha1(url)>.json   状态码、响应头、编码、url
+    <dir>/http/<sha1(url)>.body   响应体
+    <dir>/pages/<sha1(url)>.html  浏览器渲染后的页面 HTML
+    <dir>/output/                 main.py 在录制/回放时生成的报告，不覆盖正式输出
+"""
+
+import hashlib
+import json
+from pathlib import Path
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+
+_state = {
+    "mode": None,  # None / "record" / "replay"
+    "dir": None,
+}
+
+
+def start_recording(directory):
+    """开启录制模式"""
+    _state["mode"] = "record"
+    _state["dir"] = Path(directory)
+    (_state["dir"] / "http").mkdir(parents=True, exist_ok=True)
+    (_state["dir"] / "pages").mkdir(parents=True, exist_ok=True)
+
+
+def start_replay(directory):
+    """开启回放模式，目录不存在时报错"""
+    directory = Path(directory)
+    if not directory.is_dir():
+        raise FileNotFoundError(f"cassette 目录不存在: {directory}")
+    _state["mode"] = "replay"
+    _state["dir"] = directory
+
+
+def stop():
+    """关闭录制/回放"""
+    _state["mode"] = None
+    _state["dir"] = None
+
+
+def is_recording():
+    return _state["mode"] == "record"
+
+
+def is_replaying():
+    return _state["mode"] == "replay"
+
+
+def is_active():
+    return _state["mode"] is not None
+
+
+def output_dir():
+    """录制/回放时报告的输出目录 <dir>/output，未开启时返回 None"""
+    if _state["dir"] is None:
+        return None
+    return _state["dir"] / "output"
+
+
+def _key(url):
+    return hashlib.sha1(url.encode("utf-8")).hexdigest()
+
+
+def record_response(url, response, body=None, complete=True):
+    """
+    保存一个 HTTP 响应
+
+    Args:
+        body: 采集器实际读取的响应体；为 None 时使用 response.content
+        complete: 流式响应是否被完整读取；提前关闭时只保存已读部分，
+            回放时采集器读到的内容与录制时相同
+    """
+    base = _state["dir"] / "http" / _key(url)
+    meta = {
+        "url": url,
+        "status_code": response.status_code,
+        "encoding": response.encoding,
+        "headers": dict(response.headers),
+        "complete": complete,
+    }
+    base.with_suffix(".body").write_bytes(response.content if body is None else body)
+    with open(base.with_suffix(".json"), "w", encoding="utf-8") as f:
+        json.dump(meta, f, ensure_ascii=False, indent=2)
+
+
+def replay_response(url):
+    """
+    读取录制的 HTTP 响应
+
+    Raises:
+        requests.ConnectionError: cassette 中没有该 url，采集器按网络错误处理
+    """
+    base = _state["dir"] / "http" / _key(url)
+    try:
+        with open(base.with_suffix(".json"), "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        body = base.with_suffix(".body").read_bytes()
+    except (OSError, ValueError):
+        raise requests.ConnectionError(f"cassette 中没有该请求: {url}")
+
+    response = requests.Response()
+    response.status_code = meta["status_code"]
+    response.url = meta["url"]
+    response.headers = CaseInsensitiveDict(meta["headers"])
+    response.encoding = meta.get("encoding")
+    response._content = body
+    response._content_consumed = True
+    return response
+
+
+def record_page(url, html):
+    """保存一个浏览器页面的 HTML"""
+    path = _state["dir"] / "pages" / f"{_key(url)}.html"
+    path.write_text(html, encoding="utf-8")
+
+
+def replay_page(url):
+    """读取录制的页面 HTML，不存在时返回空字符串"""
+    path = _state["dir"] / "pages" / f"{_key(url)}.html"
+    try:
+        return path.read_text(encoding="utf-8")
+    except OSError:
+        return ""
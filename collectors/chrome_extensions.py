@@ -1,20 +1,57 @@
 """Chrome Extensions 采集器 - 动态爬取 Chrome Web Store"""
 
+import codecs
+import json
 import re
 import random
-import time
 import requests
+from concurrent.futures import ThreadPoolExecutor
 from html import unescape
 
+from . import http, ratelimit
 
-HEADERS = {
-    "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
-    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
-    "Accept-Language": "en-US,en;q=0.9",
-    "Connection": "keep-alive",
+
+CWS_HOST = "chromewebstore.google.com"
+
+# 详情页请求可以并发，但整体速率限制在每秒 4 个
+ratelimit.set_rate(CWS_HOST, rate=4, burst=4)
+
+
+# 扩展 ID：32 个 a-p 字母
+EXT_ID_RE = re.compile(r"[a-p]{32}")
+DETAIL_LINK_RE = re.compile(r"/detail/([^/\"']+)/([a-p]{32})")
+
+# 页面内嵌的结构化数据：AF_initDataCallback({key: 'ds:1', hash: '..', data:[...], sideChannel: {}});
+PAYLOAD_RE = re.compile(r"AF_initDataCallback\(\{key:\s*'[^']*'.*?data:(\[.*?\]), sideChannel:\s*\{\}\}\);", re.S)
+
+# 详情页字段：一个模式一次扫描匹配全部字段，每个分支都有结束标记，不会匹配到被截断的值
+DETAIL_FIELDS_RE = re.compile(
+    r"<title>(?P<name>[^<]+)</title>"
+    r"|>(?P<users>\d[\d,]+)\s*users?<"
+    r'|<meta name="description" content="(?P<description>[^"]+)"'
+    r'|aria-label="(?P<rating>[0-9.]+) out of 5 stars?"'
+)
+
+# 流式读取的块大小，以及跨块匹配需要回看的字符数
+DETAIL_CHUNK_SIZE = 16 * 1024
+DETAIL_OVERLAP = 4096
+
+FIELDS = ("name", "description", "users", "rating")
+
+# 搜索页内嵌数据中每个扩展条目的固定位置：
+#   [id, 图标 URL, 名称, 评分, 评分人数, 描述, 用户数, 分类, 更新时间戳, ...]
+PAYLOAD_POSITIONS = {
+    "name": 2,
+    "rating": 3,
+    "description": 5,
+    "users": 6,
 }
 
-# 搜索关键词列表 - 每次随机选择一个，保证结果多样性
+# 用户数的合理上限，超过的值（例如 Unix 时间戳）视为结构变化，改用详情页
+MAX_USERS = 10 ** 9
+
+
+# 搜索关键词列表 - 单关键词模式每次随机选择一个，fan_out 模式全部搜索
 SEARCH_KEYWORDS = [
     "AI assistant",
     "productivity tools",
@@ -27,80 +64,287 @@ SEARCH_KEYWORDS = [
 ]
 
 
-def fetch_chrome_extensions(limit=5):
-    """动态获取 Chrome Web Store 热门扩展"""
-    # 随机选择搜索关键词
-    keyword = random.choice(SEARCH_KEYWORDS)
-    search_url = f"https://chromewebstore.google.com/search/{requests.utils.quote(keyword)}"
+def fetch_chrome_extensions(limit=5, max_concurrency=6, fan_out=False, keywords=None):
+    """
+    动态获取 Chrome Web Store 热门扩展
+
+    优先使用搜索页内嵌的结构化数据，只有缺字段的扩展才请求详情页，
+    常见情况下每个关键词只需 1 个请求。
+
+    Args:
+        limit: 返回的扩展数
+        max_concurrency: 同时进行的请求数
+        fan_out: True 时同时搜索所有关键词，按扩展 ID 去重后按用户数、评分排序；
+            False 时随机选一个关键词，保持搜索结果顺序
+        keywords: 关键词列表，默认 SEARCH_KEYWORDS
+    """
+    keywords = keywords or SEARCH_KEYWORDS
+    if not fan_out:
+        # 随机选择搜索关键词
+        keywords = [random.choice(keywords)]
+
+    with ThreadPoolExecutor(max_workers=max(1, min(max_concurrency, len(keywords)))) as executor:
+        searches = [r for r in executor.map(_search, keywords) if r]
+
+    # 合并所有关键词的结果：按扩展 ID 去重，每个关键词取前 limit + 2 个（多取几个以防有些失败）
+    slugs = {}
+    records = {}
+    candidates = []
+    for search_slugs, search_records, order in searches:
+        for ext_id, name_slug in search_slugs.items():
+            slugs.setdefault(ext_id, name_slug)
+        for ext_id in order[:limit + 2]:
+            if ext_id not in records:
+                candidates.append(ext_id)
+                records[ext_id] = dict(search_records.get(ext_id) or {})
+            else:
+                # 同一扩展在多个关键词中出现时，用已有信息互相补全
+                for field, value in (search_records.get(ext_id) or {}).items():
+                    if records[ext_id].get(field) is None:
+                        records[ext_id][field] = value
+
+    if not candidates:
+        print(f"    未找到扩展列表")
+        return []
+
+    # 缺字段的扩展并发请求详情页补全，每个扩展只请求一次；速率由令牌桶控制
+    missing = [ext_id for ext_id in candidates if not _is_complete(records[ext_id])]
+    if missing:
+        with ThreadPoolExecutor(max_workers=max(1, min(max_concurrency, len(missing)))) as executor:
+            details = dict(zip(missing, executor.map(
+                lambda ext_id: _fetch_detail(slugs.get(ext_id, "_"), ext_id), missing,
+            )))
+    else:
+        details = {}
+
+    merged = []
+    for ext_id in candidates:
+        fields = records[ext_id]
+        if ext_id in details:
+            detail = details[ext_id]
+            if detail is None:
+                continue
+            for field in FIELDS:
+                if fields.get(field) is None:
+                    fields[field] = detail.get(field)
+        merged.append((ext_id, fields))
+
+    if fan_out:
+        merged.sort(key=lambda item: (item[1].get("users") or -1, item[1].get("rating") or -1), reverse=True)
+
+    return [_format_extension(ext_id, slugs.get(ext_id), fields) for ext_id, fields in merged[:limit]]
+
+
+def _search(keyword):
+    """
+    请求一个关键词的搜索页
+
+    Returns:
+        tuple: (slugs, records, order)，请求失败返回None
+            slugs: {ext_id: 名称 slug}
+            records: parse_search_payload 的结果
+            order: 扩展 ID 的页面顺序
+    """
+    search_url = f"https://{CWS_HOST}/search/{requests.utils.quote(keyword)}"
 
     try:
-        response = requests.get(search_url, headers=HEADERS, timeout=15)
+        response = http.get(search_url, timeout=15, cache=True)
         if response.status_code != 200:
-            print(f"    搜索页面请求失败: {response.status_code}")
-            return []
+            print(f"    搜索页面请求失败（{keyword}）: {response.status_code}")
+            return None
     except requests.RequestException as e:
-        print(f"    搜索请求错误: {e}")
-        return []
+        print(f"    搜索请求错误（{keyword}）: {e}")
+        return None
 
-    # 从搜索结果提取扩展ID和名称
-    detail_pattern = r'/detail/([^/]+)/([a-z]{32})'
-    details = re.findall(detail_pattern, response.text)
+    html = response.text
 
-    if not details:
-        print(f"    未找到扩展列表")
-        return []
+    # 从搜索结果链接提取扩展ID和名称 slug
+    slugs = {}
+    for name_slug, ext_id in DETAIL_LINK_RE.findall(html):
+        slugs.setdefault(ext_id, name_slug)
 
-    extensions = []
+    # 内嵌数据中的扩展信息（可能不完整）
+    records = parse_search_payload(html)
 
-    # 获取每个扩展的详细信息
-    for name_slug, ext_id in details[:limit + 2]:  # 多获取几个以防有些失败
-        if len(extensions) >= limit:
-            break
+    return slugs, records, list(records) or list(slugs)
 
-        detail_url = f"https://chromewebstore.google.com/detail/{name_slug}/{ext_id}"
 
-        try:
-            # 添加小延迟避免请求过快
-            time.sleep(0.3)
+def _iter_lists(node, depth=0):
+    """深度优先遍历嵌套列表"""
+    if isinstance(node, list):
+        yield node
+        if depth < 16:
+            for child in node:
+                yield from _iter_lists(child, depth + 1)
 
-            detail_resp = requests.get(detail_url, headers=HEADERS, timeout=15)
-            if detail_resp.status_code != 200:
-                continue
 
-            html = detail_resp.text
-
-            # 提取标题
-            title_match = re.search(r"<title>([^<]+)</title>", html)
-            name = "Unknown"
-            if title_match:
-                name = title_match.group(1).replace(" - Chrome Web Store", "").strip()
-                name = unescape(name)
-
-            # 提取用户数
-            user_match = re.search(r">(\d[\d,]+)\s*users?<", html)
-            users = user_match.group(1) + " users" if user_match else "N/A"
-
-            # 提取描述
-            desc_match = re.search(r'<meta name="description" content="([^"]+)"', html)
-            description = "无描述"
-            if desc_match:
-                description = unescape(desc_match.group(1))
-
-            # 提取评分 (从 aria-label="4.7 out of 5 stars" 格式)
-            rating = "N/A"
-            rating_match = re.search(r'aria-label="([0-9.]+) out of 5 stars?"', html)
-            if rating_match:
-                rating = f"{rating_match.group(1)}/5.0"
-
-            extensions.append({
-                "name": name,
-                "description": description,
-                "users": users,
-                "rating": rating,
-                "link": detail_url,
-            })
-
-        except requests.RequestException:
+def _is_url(value):
+    return value.startswith(("http://", "https://", "//"))
+
+
+def _valid_text(value):
+    return isinstance(value, str) and bool(value.strip()) and not _is_url(value)
+
+
+def _valid_number(value, low, high, integer=False):
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return False
+    if integer and not isinstance(value, int):
+        return False
+    return low <= value <= high
+
+
+# 每个字段的合理性检查，不通过的字段记为 None
+FIELD_CHECKS = {
+    "name": _valid_text,
+    "description": _valid_text,
+    "rating": lambda v: _valid_number(v, 0, 5),
+    "users": lambda v: _valid_number(v, 0, MAX_USERS, integer=True),
+}
+
+
+def _record_from_list(node):
+    """
+    按 PAYLOAD_POSITIONS 从以扩展 ID 开头的列表中读取字段
+
+    位置不存在或值未通过合理性检查的字段为 None，该扩展之后会请求详情页补全。
+    """
+    record = {}
+    for field, position in PAYLOAD_POSITIONS.items():
+        value = node[position] if position < len(node) else None
+        if not FIELD_CHECKS[field](value):
+            record[field] = None
+        elif isinstance(value, str):
+            record[field] = value.strip()
+        else:
+            record[field] = value
+    return record
+
+
+def parse_search_payload(html):
+    """
+    解析搜索页内嵌的 AF_initDataCallback 数据
+
+    Returns:
+        dict: {ext_id: {"name", "description", "users", "rating"}}，按页面顺序；
+              未识别的字段为 None，结构无法解析时返回空字典
+    """
+    records = {}
+    for match in PAYLOAD_RE.finditer(html):
+        try:
+            data = json.loads(match.group(1))
+        except ValueError:
             continue
+        for node in _iter_lists(data):
+            if node and isinstance(node[0], str) and EXT_ID_RE.fullmatch(node[0]):
+                # 同一 ID 出现在多个列表中时，保留通过检查的字段最多的那个
+                record = _record_from_list(node)
+                current = records.get(node[0])
+                if current is None or _valid_count(record) > _valid_count(current):
+                    records[node[0]] = record
+    return records
+
+
+def _valid_count(record):
+    return sum(value is not None for value in record.values())
+
+
+def _is_complete(record):
+    return bool(record) and all(record.get(field) is not None for field in FIELDS)
+
+
+def _format_extension(ext_id, name_slug, fields):
+    """转换为报告使用的格式"""
+    users = fields.get("users")
+    rating = fields.get("rating")
+    return {
+        "name": fields.get("name") or "Unknown",
+        "description": fields.get("description") or "无描述",
+        "users": f"{users:,} users" if users is not None else "N/A",
+        "rating": f"{rating:.1f}/5.0" if rating is not None else "N/A",
+        "link": f"https://{CWS_HOST}/detail/{name_slug or '_'}/{ext_id}",
+    }
+
+
+def _convert_field(field, raw):
+    """把匹配到的原始文本转换为字段值"""
+    if field == "name":
+        return unescape(raw.replace(" - Chrome Web Store", "").strip())
+    if field == "users":
+        return int(raw.replace(",", ""))
+    if field == "description":
+        return unescape(raw)
+    return float(raw)
+
+
+def extract_detail_fields(chunks):
+    """
+    从详情页的文本块中流式提取字段，全部找到后立即停止读取
+
+    每个字段取第一次出现的值；每次只扫描新到达的文本和回看窗口。
+
+    Args:
+        chunks: 字符串块迭代器
+
+    Returns:
+        dict: {"name", "description", "users", "rating"}，未找到的字段为 None
+    """
+    fields = dict.fromkeys(FIELDS)
+    buffer = ""
+    scanned = 0
+    for chunk in chunks:
+        buffer += chunk
+        for match in DETAIL_FIELDS_RE.finditer(buffer, max(0, scanned - DETAIL_OVERLAP)):
+            field = match.lastgroup
+            if fields[field] is None:
+                fields[field] = _convert_field(field, match.group(field))
+        scanned = len(buffer)
+        if all(value is not None for value in fields.values()):
+            break
+        # 只保留回看窗口，避免整页留在内存中
+        if len(buffer) > DETAIL_OVERLAP:
+            buffer = buffer[-DETAIL_OVERLAP:]
+            scanned = len(buffer)
+    return fields
+
+
+def _fetch_detail(name_slug, ext_id):
+    """
+    流式获取单个扩展详情页并提取字段，失败返回None
+
+    详情页动态生成、几乎没有缓存验证信息，且需要在读到全部字段后中断下载，
+    所以不经过磁盘缓存。
+    """
+    detail_url = f"https://{CWS_HOST}/detail/{name_slug}/{ext_id}"
+
+    try:
+        detail_resp = http.get(detail_url, timeout=15, stream=True)
+        if detail_resp.status_code != 200:
+            detail_resp.close()
+            return None
+    except requests.RequestException:
+        return None
+
+    decoder = codecs.getincrementaldecoder(detail_resp.encoding or "utf-8")(errors="replace")
+    read = [0]
+
+    def text_chunks():
+        for chunk in detail_resp.iter_content(chunk_size=DETAIL_CHUNK_SIZE):
+            read[0] += len(chunk)
+            yield decoder.decode(chunk)
+
+    try:
+        fields = extract_detail_fields(text_chunks())
+    except requests.RequestException:
+        return None
+    finally:
+        detail_resp.close()
+
+    # 读取字节数 vs 页面总字节数（均为传输字节数；没有 Content-Length 时为未知）
+    raw = getattr(detail_resp, "raw", None)
+    wire_read = raw.tell() if hasattr(raw, "tell") else read[0]
+    total = detail_resp.headers.get("Content-Length")
+    total_text = f"{int(total) / 1024:.0f} KB" if total and total.isdigit() else "未知"
+    print(f"    详情页 {ext_id}: 读取 {wire_read / 1024:.0f} KB / 共 {total_text}")
 
-    return extensions
+    return fields
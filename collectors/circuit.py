@@ -0,0 +1,68 @@
+"""数据源熔断器 - 连续失败的数据源在之后几次运行中直接跳过
+
+状态保存在 data/cache/circuit.json，跨天累计：
+    {key: {"failures": 连续失败次数, "skip_remaining": 剩余跳过次数, "last_error": 最近错误}}
+
+连续失败 FAILURE_THRESHOLD 次后跳过 SKIP_RUNS 次运行；跳过期满后再尝试一次，
+成功则清零，失败则再次跳过。
+"""
+
+import json
+from pathlib import Path
+
+
+STATE_PATH = Path(__file__).parent.parent / "data" / "cache" / "circuit.json"
+
+# 连续失败多少次后熔断
+FAILURE_THRESHOLD = 3
+
+# 熔断后跳过的运行次数
+SKIP_RUNS = 2
+
+
+def load_state(path=STATE_PATH):
+    """读取熔断状态，不存在或损坏时返回空状态"""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_state(state, path=STATE_PATH):
+    """保存熔断状态，写入失败不影响运行"""
+    path = Path(path)
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(state, f, ensure_ascii=False, indent=2)
+        tmp_path.replace(path)
+    except OSError:
+        pass
+
+
+def should_skip(state, key):
+    """
+    本次运行是否跳过该数据源，跳过时消耗一次剩余次数
+
+    Returns:
+        bool
+    """
+    entry = state.get(key)
+    if not entry or entry.get("skip_remaining", 0) <= 0:
+        return False
+    entry["skip_remaining"] -= 1
+    return True
+
+
+def record(state, key, ok, error=None):
+    """记录一次运行结果，失败次数达到阈值时熔断"""
+    if ok:
+        state.pop(key, None)
+        return
+    entry = state.setdefault(key, {"failures": 0, "skip_remaining": 0})
+    entry["failures"] += 1
+    entry["last_error"] = error
+    if entry["failures"] >= FAILURE_THRESHOLD:
+        entry["skip_remaining"] = SKIP_RUNS
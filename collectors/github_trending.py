@@ -1,30 +1,95 @@
 """GitHub Trending 采集器"""
 
+import re
+from concurrent.futures import ThreadPoolExecutor
+
 import requests
-from bs4 import BeautifulSoup
 
+from . import http
+from .parsing import make_soup, strainer
+
+
+TRENDING_URL = "https://github.com/trending"
+
+# 只解析项目卡片
+REPO_STRAINER = strainer("article", class_="Box-row")
+
+NUMBER_RE = re.compile(r"\d[\d,]*")
+
+
+def _to_int(text):
+    """从 "1,234 stars today" 之类的文本中取出整数，没有数字返回None"""
+    match = NUMBER_RE.search(text or "")
+    return int(match.group(0).replace(",", "")) if match else None
+
+
+def _scope_url(language, since):
+    """榜单地址：默认榜单（全部语言、daily）保持原地址"""
+    path = f"{TRENDING_URL}/{language}" if language else TRENDING_URL
+    return path if since == "daily" and not language else f"{path}?since={since}"
+
+
+def fetch_trending_repos(limit=5, languages=None, since=("daily",), max_concurrency=4):
+    """
+    抓取GitHub trending页面并提取项目信息
 
-HEADERS = {
-    "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
-    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
-    "Accept-Language": "en-US,en;q=0.5",
-    "Accept-Encoding": "gzip, deflate, br",
-    "Connection": "keep-alive",
-}
+    多个语言 × 时间范围的榜单并发抓取，按榜单顺序合并并按仓库名去重。
 
+    Args:
+        limit: 每个榜单取的项目数
+        languages: 语言 slug 列表（如 "python"、"rust"），None 表示全部语言
+        since: 时间范围列表，取值 daily / weekly / monthly
+        max_concurrency: 同时请求的榜单数
 
-def fetch_trending_repos(limit=5):
-    """抓取GitHub trending页面并提取项目信息"""
-    url = "https://github.com/trending"
+    Returns:
+        list: 项目列表，数值字段已解析为整数
+    """
+    scopes = [(language, period) for language in (languages or [None]) for period in since]
+
+    with ThreadPoolExecutor(max_workers=max(1, min(max_concurrency, len(scopes)))) as executor:
+        results = list(executor.map(lambda scope: _fetch_scope(*scope, limit), scopes))
+
+    repos = []
+    seen = {}
+    for scope_repos in results:
+        for repo in scope_repos:
+            if repo["name"] in seen:
+                # 同一仓库出现在多个榜单时记录所有榜单，并从 daily 榜单补上 stars_today
+                kept = seen[repo["name"]]
+                kept["scopes"].extend(repo["scopes"])
+                if kept["stars_today"] is None:
+                    kept["stars_today"] = repo["stars_today"]
+                continue
+            seen[repo["name"]] = repo
+            repos.append(repo)
+
+    return repos
+
+
+def _fetch_scope(language, since, limit):
+    """抓取单个榜单，失败返回空列表"""
+    url = _scope_url(language, since)
 
     try:
-        response = requests.get(url, headers=HEADERS, timeout=10)
+        response = http.get(url, timeout=10, cache=True)
         response.raise_for_status()
     except requests.RequestException as e:
         print(f"请求失败: {e}")
         return []
 
-    soup = BeautifulSoup(response.text, "html.parser")
+    repos = _parse_repos(response.text, limit)
+    scope = f"{language or 'all'}/{since}"
+    for repo in repos:
+        repo["since"] = since
+        repo["scopes"] = [scope]
+        # stars_today 只对 daily 榜单有意义
+        repo["stars_today"] = repo["period_stars"] if since == "daily" else None
+    return repos
+
+
+def _parse_repos(html, limit):
+    """解析 trending 页面的项目卡片"""
+    soup = make_soup(html, parse_only=REPO_STRAINER)
     repos = []
 
     # 查找所有repo项目
@@ -41,14 +106,23 @@ def fetch_trending_repos(limit=5):
         desc_tag = article.select_one("p")
         description = desc_tag.get_text(strip=True) if desc_tag else "无描述"
 
-        # 今日stars
+        # 榜单周期内新增stars（原始文本保留给报告展示）
         stars_tag = article.select_one("span.d-inline-block.float-sm-right")
         today_stars = stars_tag.get_text(strip=True) if stars_tag else "N/A"
 
+        # 语言、总stars、forks
+        lang_tag = article.select_one('[itemprop="programmingLanguage"]')
+        stars_link = article.select_one('a[href$="/stargazers"]')
+        forks_link = article.select_one('a[href$="/forks"]')
+
         repos.append({
             "name": repo_name,
             "description": description,
             "today_stars": today_stars,
+            "period_stars": _to_int(today_stars),
+            "stars": _to_int(stars_link.get_text()) if stars_link else None,
+            "forks": _to_int(forks_link.get_text()) if forks_link else None,
+            "language": lang_tag.get_text(strip=True) if lang_tag else None,
         })
 
     return repos
@@ -1,48 +1,170 @@
 """Hacker News 采集器"""
 
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
 import requests
 
+from . import cassette, http
 
-HEADERS = {
-    "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36",
-}
 
 HN_API_BASE = "https://hacker-news.firebaseio.com/v0"
 
+# 可采集的榜单 -> API 列表名
+FEEDS = {
+    "top": "topstories",
+    "new": "newstories",
+    "best": "beststories",
+    "show": "showstories",
+    "ask": "askstories",
+}
+
+# 条目缓存：已获取过的 story 在排名数据仍新鲜时不重新下载
+ITEM_CACHE_PATH = Path(__file__).parent.parent / "data" / "cache" / "hn_items.json"
+
+# 刷新规则 (story 发布时长上限秒数, 缓存有效秒数)：越新的 story 分数/评论变化越快
+ITEM_REFRESH_RULES = [
+    (2 * 86400, 15 * 60),
+    (7 * 86400, 6 * 3600),
+]
+ITEM_REFRESH_DEFAULT = 7 * 86400
+
+# 超过该时长未出现在任何榜单的缓存条目会被清理
+ITEM_CACHE_RETENTION = 14 * 86400
+
+
+def _load_item_cache():
+    try:
+        with open(ITEM_CACHE_PATH, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_item_cache(cache):
+    """写入条目缓存并清理长期未出现的条目，写入失败不影响采集"""
+    now = time.time()
+    cache = {k: v for k, v in cache.items() if now - v.get("last_seen", 0) < ITEM_CACHE_RETENTION}
+    try:
+        ITEM_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = ITEM_CACHE_PATH.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(cache, f)
+        tmp_path.replace(ITEM_CACHE_PATH)
+    except OSError:
+        pass
+
+
+def _is_stale(entry, now):
+    """按 story 发布时长判断缓存的分数/评论数是否需要刷新"""
+    story_age = now - (entry["story"].get("time") or 0)
+    cached_age = now - entry["fetched_at"]
+    for max_story_age, ttl in ITEM_REFRESH_RULES:
+        if story_age < max_story_age:
+            return cached_age > ttl
+    return cached_age > ITEM_REFRESH_DEFAULT
+
+
+def _fetch_item(story_id):
+    """获取单个story原始数据，失败返回None"""
+    try:
+        response = http.get(f"{HN_API_BASE}/item/{story_id}.json", timeout=10)
+        response.raise_for_status()
+        return response.json() or None
+    except (requests.RequestException, ValueError):
+        return None
+
 
-def fetch_hackernews_posts(limit=5):
-    """通过官方API获取Hacker News热门文章"""
+def _fetch_feed(feed):
+    """获取一个榜单的 story ID 列表，失败返回空列表"""
     try:
-        # 获取top stories列表
-        response = requests.get(f"{HN_API_BASE}/topstories.json", headers=HEADERS, timeout=10)
+        response = http.get(f"{HN_API_BASE}/{FEEDS[feed]}.json", timeout=10, cache=True)
         response.raise_for_status()
-        story_ids = response.json()[:limit]
-    except requests.RequestException as e:
+        return response.json() or []
+    except (requests.RequestException, ValueError) as e:
         print(f"请求失败: {e}")
         return []
 
+
+def _to_post(story_id, story, feeds):
+    # 如果没有url，使用HN讨论链接
+    url = story.get("url") or f"https://news.ycombinator.com/item?id={story_id}"
+
+    return {
+        "id": story_id,
+        "title": story.get("title", "无标题"),
+        "author": story.get("by", "unknown"),
+        "score": story.get("score", 0),
+        "comments": story.get("descendants", 0),
+        "url": url,
+        "feeds": feeds,
+    }
+
+
+def fetch_hackernews_posts(limit=5, feeds=("top",), max_concurrency=10, use_item_cache=True,
+                           per_feed=None):
+    """
+    通过官方API获取Hacker News热门文章
+
+    多个榜单的 ID 列表并发获取，取并集后每个 story 只解析一次；
+    缓存中排名数据仍新鲜的 story 不重新下载。
+    多个榜单合并后按分数排序，只返回前 limit 篇，报告中的条数与单榜单时相同。
+
+    Args:
+        limit: 返回的文章数上限
+        feeds: 榜单列表，取值见 FEEDS
+        per_feed: 每个榜单取的文章数，默认同 limit
+        max_concurrency: 同时进行的请求数，超过 http 连接池大小时多余连接不会被复用
+        use_item_cache: 是否使用条目缓存（录制/回放模式下自动关闭）
+
+    Returns:
+        list: 单个榜单时按榜单排名排列，多个榜单时按分数降序；"feeds" 字段记录出现的榜单
+    """
+    feeds = [feed for feed in feeds if feed in FEEDS]
+    if not feeds:
+        return []
+
+    with ThreadPoolExecutor(max_workers=max(1, min(max_concurrency, len(feeds)))) as executor:
+        feed_ids = list(executor.map(_fetch_feed, feeds))
+
+    # 并集：保持首次出现的顺序，并记录每个 story 所在的榜单
+    story_feeds = {}
+    for feed, ids in zip(feeds, feed_ids):
+        for story_id in ids[:per_feed or limit]:
+            story_feeds.setdefault(story_id, []).append(feed)
+
+    if not story_feeds:
+        return []
+
+    use_item_cache = use_item_cache and not cassette.is_active()
+    cache = _load_item_cache() if use_item_cache else {}
+    now = time.time()
+
+    to_fetch = [
+        story_id for story_id in story_feeds
+        if str(story_id) not in cache or _is_stale(cache[str(story_id)], now)
+    ]
+
+    # 并发获取详情，map 保持原始排名顺序
+    if to_fetch:
+        with ThreadPoolExecutor(max_workers=max(1, min(max_concurrency, len(to_fetch)))) as executor:
+            for story_id, story in zip(to_fetch, executor.map(_fetch_item, to_fetch)):
+                if story:
+                    cache[str(story_id)] = {"story": story, "fetched_at": now}
+
     posts = []
-    for story_id in story_ids:
-        try:
-            # 获取单个story详情
-            response = requests.get(f"{HN_API_BASE}/item/{story_id}.json", headers=HEADERS, timeout=10)
-            response.raise_for_status()
-            story = response.json()
-
-            if not story:
-                continue
-
-            # 如果没有url，使用HN讨论链接
-            url = story.get("url") or f"https://news.ycombinator.com/item?id={story_id}"
-
-            posts.append({
-                "title": story.get("title", "无标题"),
-                "author": story.get("by", "unknown"),
-                "score": story.get("score", 0),
-                "comments": story.get("descendants", 0),
-                "url": url,
-            })
-        except requests.RequestException:
+    for story_id, in_feeds in story_feeds.items():
+        entry = cache.get(str(story_id))
+        if not entry:
             continue
+        entry["last_seen"] = now
+        posts.append(_to_post(story_id, entry["story"], in_feeds))
+
+    if use_item_cache:
+        _save_item_cache(cache)
 
-    return posts
+    if len(feeds) > 1:
+        posts.sort(key=lambda post: post["score"] or 0, reverse=True)
+    return posts[:limit]
@@ -0,0 +1,215 @@
+"""共享 HTTP 客户端 - 按主机复用 keep-alive 连接池，统一请求头与重试策略"""
+
+import threading
+import time
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from . import budget, cassette, http_cache, ratelimit
+
+
+# 所有采集器共用的默认请求头（不声明 br，requests 默认无法解码 brotli）
+DEFAULT_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
+    "Accept-Language": "en-US,en;q=0.9",
+    "Connection": "keep-alive",
+}
+
+# 连接池与重试配置，可通过 configure() 修改
+_config = {
+    "pool_size": 10,
+    "max_retries": 2,
+    "backoff_factor": 0.5,
+    # 缓存新鲜期（秒）：0 表示每次都发条件请求；>0 时期限内直接用缓存不联网
+    "cache_ttl": 0,
+    # 磁盘缓存上限（字节），超出后按 LRU 淘汰
+    "cache_max_bytes": 50 * 1024 * 1024,
+}
+
+# 每个主机一个 Session
+_sessions = {}
+_lock = threading.Lock()
+
+
+def configure(pool_size=None, max_retries=None, backoff_factor=None,
+              cache_ttl=None, cache_max_bytes=None):
+    """
+    修改连接池、重试与缓存配置，已创建的 Session 会被关闭并按新配置重建
+
+    Args:
+        pool_size: 每个主机的最大连接数
+        max_retries: 连接错误/5xx/429 的最大重试次数
+        backoff_factor: 指数退避基数（秒），第 n 次重试等待 backoff_factor * 2^(n-1)
+        cache_ttl: 缓存新鲜期（秒），期限内的 cache=True 请求不联网
+        cache_max_bytes: 磁盘缓存上限（字节）
+    """
+    with _lock:
+        if pool_size is not None:
+            _config["pool_size"] = pool_size
+        if max_retries is not None:
+            _config["max_retries"] = max_retries
+        if backoff_factor is not None:
+            _config["backoff_factor"] = backoff_factor
+        if cache_ttl is not None:
+            _config["cache_ttl"] = cache_ttl
+        if cache_max_bytes is not None:
+            _config["cache_max_bytes"] = cache_max_bytes
+        for session in _sessions.values():
+            session.close()
+        _sessions.clear()
+
+
+def _new_session():
+    """按当前配置创建带连接池和重试的 Session"""
+    retry = Retry(
+        total=_config["max_retries"],
+        backoff_factor=_config["backoff_factor"],
+        status_forcelist=(429, 500, 502, 503, 504),
+        allowed_methods=frozenset(["GET", "HEAD"]),
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(
+        pool_connections=1,
+        pool_maxsize=_config["pool_size"],
+        max_retries=retry,
+    )
+    session = requests.Session()
+    session.headers.update(DEFAULT_HEADERS)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def get_session(url):
+    """获取 url 所属主机的共享 Session"""
+    host = urlsplit(url).netloc
+    with _lock:
+        session = _sessions.get(host)
+        if session is None:
+            session = _sessions[host] = _new_session()
+        return session
+
+
+def get(url, headers=None, timeout=10, cache=False, **kwargs):
+    """
+    通过共享连接池发送 GET 请求
+
+    Args:
+        url: 请求地址
+        headers: 额外请求头，会覆盖默认请求头中的同名项
+        timeout: 超时秒数，设置了运行截止时间（budget）时不超过剩余时间
+        cache: 是否使用磁盘缓存（条件请求 + 新鲜期），只用于幂等的页面/接口
+        **kwargs: 透传给 requests.Session.get；stream=True 时缓存和录制都不会预先读取响应体
+
+    Returns:
+        requests.Response，缓存命中时 response.from_cache 为 True
+    """
+    if cassette.is_replaying():
+        return cassette.replay_response(url)
+
+    response = _get(url, headers, timeout, cache, **kwargs)
+    if cassette.is_recording():
+        # 缓存命中的响应体已在内存中，直接保存
+        if kwargs.get("stream") and not getattr(response, "from_cache", False):
+            _on_stream_read(response, lambda body, complete: cassette.record_response(
+                url, response, body, complete,
+            ))
+        else:
+            cassette.record_response(url, response)
+    return response
+
+
+def _on_stream_read(response, callback):
+    """
+    流式响应读取完毕（或提前关闭）时回调，不额外读取响应体
+
+    调用方通过 iter_content / content 读取时保留已读的块；
+    读到末尾时调用 callback(body, True)，未读完就 close() 时调用 callback(已读部分, False)。
+    只回调一次。
+    """
+    chunks = []
+    done = []
+    iter_content = response.iter_content
+    close = response.close
+
+    def finish(complete):
+        if not done:
+            done.append(True)
+            callback(b"".join(chunks), complete)
+
+    def capture(chunk_size=1, decode_unicode=False):
+        def read():
+            for chunk in iter_content(chunk_size):
+                chunks.append(chunk)
+                yield chunk
+            finish(True)
+
+        if decode_unicode:
+            return requests.utils.stream_decode_response_unicode(read(), response)
+        return read()
+
+    def capture_close():
+        finish(False)
+        close()
+
+    response.iter_content = capture
+    response.close = capture_close
+
+
+def _get(url, headers, timeout, cache, **kwargs):
+    """实际发送请求，cache=True 时走磁盘缓存"""
+    if budget.exhausted():
+        raise requests.Timeout(f"运行时间预算已用完: {url}")
+    timeout = budget.limit(timeout)
+
+    if not cache:
+        ratelimit.acquire(url)
+        return get_session(url).get(url, headers=headers, timeout=timeout, **kwargs)
+
+    meta, body = http_cache.load(url)
+    if meta and _config["cache_ttl"] > 0 and time.time() - meta["stored_at"] < _config["cache_ttl"]:
+        http_cache.mark_used(url)
+        return http_cache.to_response(meta, body)
+
+    request_headers = dict(headers or {})
+    if meta:
+        request_headers.update(http_cache.validators(meta))
+
+    ratelimit.acquire(url)
+    response = get_session(url).get(url, headers=request_headers, timeout=timeout, **kwargs)
+
+    if response.status_code == 304 and meta:
+        http_cache.touch(url, meta)
+        return http_cache.to_response(meta, body)
+
+    # 没有验证信息的响应只在 TTL 模式下才值得缓存
+    if response.status_code == 200 and (
+        _config["cache_ttl"] > 0
+        or "ETag" in response.headers
+        or "Last-Modified" in response.headers
+    ):
+        if kwargs.get("stream"):
+            # 只缓存被完整读取的响应体，提前停止读取的不缓存
+            _on_stream_read(response, lambda body, complete: complete and _store(url, response, body))
+        else:
+            _store(url, response)
+
+    return response
+
+
+def _store(url, response, body=None):
+    http_cache.store(url, response, body)
+    http_cache.evict(_config["cache_max_bytes"])
+
+
+def close_all():
+    """关闭所有 Session，释放连接"""
+    with _lock:
+        for session in _sessions.values():
+            session.close()
+        _sessions.clear()
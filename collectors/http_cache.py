@@ -0,0 +1,144 @@
+"""HTTP 响应磁盘缓存 - 保存 ETag/Last-Modified 用于条件请求，按大小做 LRU 淘汰"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+
+# 缓存目录：每个 URL 一对文件 <key>.json（元数据）+ <key>.body（响应体）
+CACHE_DIR = Path(__file__).parent.parent / "data" / "cache" / "http"
+
+# 缓存中保留的响应头
+KEPT_HEADERS = ("Content-Type", "ETag", "Last-Modified", "Cache-Control")
+
+_lock = threading.Lock()
+
+
+def _key(url):
+    return hashlib.sha1(url.encode("utf-8")).hexdigest()
+
+
+def load(url):
+    """
+    读取缓存条目
+
+    Returns:
+        tuple: (meta, body)，不存在或损坏时返回 (None, None)
+    """
+    key = _key(url)
+    meta_path = CACHE_DIR / f"{key}.json"
+    body_path = CACHE_DIR / f"{key}.body"
+    try:
+        with open(meta_path, "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        body = body_path.read_bytes()
+    except (OSError, ValueError):
+        return None, None
+    if meta.get("url") != url:
+        return None, None
+    return meta, body
+
+
+def store(url, response, body=None):
+    """
+    保存响应体和验证信息，写入失败不影响采集
+
+    Args:
+        body: 已读取的完整响应体；为 None 时使用 response.content
+    """
+    key = _key(url)
+    meta = {
+        "url": url,
+        "stored_at": time.time(),
+        "encoding": response.encoding,
+        "headers": {h: response.headers[h] for h in KEPT_HEADERS if h in response.headers},
+    }
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        body_tmp = CACHE_DIR / f"{key}.body.tmp"
+        body_tmp.write_bytes(response.content if body is None else body)
+        body_tmp.replace(CACHE_DIR / f"{key}.body")
+        _write_meta(key, meta)
+    except OSError:
+        pass
+
+
+def touch(url, meta):
+    """304 命中后刷新存储时间（同时更新 LRU 顺序）"""
+    meta["stored_at"] = time.time()
+    try:
+        _write_meta(_key(url), meta)
+    except OSError:
+        pass
+
+
+def _write_meta(key, meta):
+    meta_tmp = CACHE_DIR / f"{key}.json.tmp"
+    with open(meta_tmp, "w", encoding="utf-8") as f:
+        json.dump(meta, f)
+    meta_tmp.replace(CACHE_DIR / f"{key}.json")
+
+
+def mark_used(url):
+    """记录一次命中，LRU 按元数据文件 mtime 排序"""
+    try:
+        os.utime(CACHE_DIR / f"{_key(url)}.json")
+    except OSError:
+        pass
+
+
+def validators(meta):
+    """根据缓存元数据生成条件请求头"""
+    headers = {}
+    if "ETag" in meta["headers"]:
+        headers["If-None-Match"] = meta["headers"]["ETag"]
+    if "Last-Modified" in meta["headers"]:
+        headers["If-Modified-Since"] = meta["headers"]["Last-Modified"]
+    return headers
+
+
+def to_response(meta, body):
+    """把缓存条目还原成 requests.Response"""
+    response = requests.Response()
+    response.status_code = 200
+    response.url = meta["url"]
+    response.headers = CaseInsensitiveDict(meta["headers"])
+    response.encoding = meta.get("encoding")
+    response._content = body
+    response._content_consumed = True
+    response.from_cache = True
+    return response
+
+
+def evict(max_bytes):
+    """缓存总大小超过 max_bytes 时，按最近使用时间淘汰最旧的条目"""
+    with _lock:
+        if not CACHE_DIR.exists():
+            return
+        entries = []
+        total = 0
+        for meta_path in CACHE_DIR.glob("*.json"):
+            body_path = meta_path.with_suffix(".body")
+            try:
+                size = meta_path.stat().st_size + body_path.stat().st_size
+                mtime = meta_path.stat().st_mtime
+            except OSError:
+                continue
+            entries.append((mtime, size, meta_path, body_path))
+            total += size
+
+        for mtime, size, meta_path, body_path in sorted(entries, key=lambda e: e[0]):
+            if total <= max_bytes:
+                break
+            for path in (meta_path, body_path):
+                try:
+                    path.unlink()
+                except OSError:
+                    pass
+            total -= size
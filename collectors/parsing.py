@@ -0,0 +1,29 @@
+"""HTML 解析后端 - 优先使用 lxml（C 实现），并支持只解析目标节点"""
+
+from bs4 import BeautifulSoup, SoupStrainer
+
+try:
+    import lxml  # noqa: F401
+    PARSER = "lxml"
+except ImportError:
+    PARSER = "html.parser"
+
+
+def make_soup(html, parse_only=None, parser=None):
+    """
+    构建 BeautifulSoup
+
+    Args:
+        html: 页面 HTML
+        parse_only: SoupStrainer，只保留匹配的节点及其子树，其余节点不建树
+        parser: 指定解析器，默认 PARSER（有 lxml 时为 lxml）
+
+    Returns:
+        BeautifulSoup
+    """
+    return BeautifulSoup(html, parser or PARSER, parse_only=parse_only)
+
+
+def strainer(name=None, **attrs):
+    """SoupStrainer 的简写，例如 strainer("tr", class_="el-table__row")"""
+    return SoupStrainer(name, **attrs)
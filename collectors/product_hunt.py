@@ -1,57 +1,94 @@
 """Product Hunt 采集器"""
 
+import re
+import xml.etree.ElementTree as ET
+from html import unescape
+
 import requests
-from bs4 import BeautifulSoup
+
+from . import http
+
+
+FEED_URL = "https://www.producthunt.com/feed"
+
+# content 中的第一个 <p>，以及用于去掉其中内联标签的模式
+FIRST_P_RE = re.compile(r"<p[^>]*>(.*?)</p>", re.S | re.I)
+TAG_RE = re.compile(r"<[^>]+>")
+
+
+def _local(tag):
+    """去掉命名空间：{http://www.w3.org/2005/Atom}entry -> entry"""
+    return tag.rsplit("}", 1)[-1]
+
+
+def _first_paragraph(content_html):
+    """从 entry 的 HTML 内容中取第一个 <p> 的纯文本"""
+    match = FIRST_P_RE.search(content_html or "")
+    if not match:
+        return ""
+    return " ".join(unescape(TAG_RE.sub("", match.group(1))).split())
+
+
+def _parse_entry(entry):
+    """把一个 <entry> 元素转换为产品字典"""
+    name = "未知产品"
+    tagline = "无描述"
+    link = "N/A"
+    for child in entry:
+        tag = _local(child.tag)
+        if tag == "title" and name == "未知产品":
+            name = (child.text or "").strip() or name
+        elif tag == "content":
+            # 产品描述通常在第一个p标签
+            tagline = _first_paragraph(child.text) or tagline
+        elif tag == "link" and link == "N/A":
+            link = child.get("href", "N/A")
+    return {
+        "name": name,
+        "tagline": tagline,
+        "link": link,
+    }
 
 
-HEADERS = {
-    "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
-    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
-    "Accept-Language": "en-US,en;q=0.5",
-    "Accept-Encoding": "gzip, deflate, br",
-    "Connection": "keep-alive",
-}
+def parse_feed(chunks, limit):
+    """
+    流式解析 Atom feed，取到 limit 个 entry 后立即停止
+
+    Args:
+        chunks: 字节块迭代器（如 response.iter_content()）
+        limit: 需要的 entry 数
+
+    Returns:
+        list: 产品列表
+    """
+    parser = ET.XMLPullParser(events=("end",))
+    products = []
+    for chunk in chunks:
+        parser.feed(chunk)
+        for _, elem in parser.read_events():
+            if _local(elem.tag) != "entry":
+                continue
+            products.append(_parse_entry(elem))
+            # 已处理的 entry 不再保留在内存中
+            elem.clear()
+            if len(products) >= limit:
+                return products
+    return products
 
 
 def fetch_product_hunt_posts(limit=5):
     """通过RSS feed获取Product Hunt产品信息"""
-    url = "https://www.producthunt.com/feed"
-
     try:
-        response = requests.get(url, headers=HEADERS, timeout=10)
+        response = http.get(FEED_URL, timeout=10, stream=True)
         response.raise_for_status()
     except requests.RequestException as e:
         print(f"请求失败: {e}")
         return []
 
-    soup = BeautifulSoup(response.text, "xml")
-    products = []
-
-    entries = soup.find_all("entry")[:limit]
-
-    for entry in entries:
-        # 产品名称
-        title_tag = entry.find("title")
-        name = title_tag.get_text(strip=True) if title_tag else "未知产品"
-
-        # 产品描述 (从content中提取)
-        content_tag = entry.find("content")
-        tagline = "无描述"
-        if content_tag:
-            content_soup = BeautifulSoup(content_tag.get_text(), "html.parser")
-            # 描述通常在第一个p标签
-            p_tag = content_soup.find("p")
-            if p_tag:
-                tagline = p_tag.get_text(strip=True)
-
-        # 产品链接
-        link_tag = entry.find("link")
-        link = link_tag.get("href", "N/A") if link_tag else "N/A"
-
-        products.append({
-            "name": name,
-            "tagline": tagline,
-            "link": link,
-        })
-
-    return products
+    try:
+        return parse_feed(response.iter_content(chunk_size=16 * 1024), limit)
+    except (ET.ParseError, requests.RequestException) as e:
+        print(f"解析失败: {e}")
+        return []
+    finally:
+        response.close()
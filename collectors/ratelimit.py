@@ -0,0 +1,59 @@
+"""按主机的令牌桶限速器 - 请求可以并发，但发出速率受控
+
+用法：
+    ratelimit.set_rate("chromewebstore.google.com", rate=4, burst=4)
+
+设置后，collectors.http 对该主机的每个实际网络请求都会先取得一个令牌；
+缓存命中和回放不消耗令牌。未设置速率的主机不限速。
+"""
+
+import threading
+import time
+from urllib.parse import urlsplit
+
+
+class TokenBucket:
+    """线程安全的令牌桶：平均每秒 rate 个请求，最多连续突发 burst 个"""
+
+    def __init__(self, rate, burst=1):
+        self.rate = float(rate)
+        self.burst = max(1, int(burst))
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """取得一个令牌，没有令牌时阻塞到下一个令牌生成"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+_buckets = {}
+_lock = threading.Lock()
+
+
+def set_rate(host, rate, burst=1):
+    """为主机设置限速（每秒请求数 rate，突发上限 burst）"""
+    with _lock:
+        _buckets[host] = TokenBucket(rate, burst)
+
+
+def clear_rate(host):
+    """取消主机限速"""
+    with _lock:
+        _buckets.pop(host, None)
+
+
+def acquire(url):
+    """url 所属主机设置了限速时取得一个令牌，否则立即返回"""
+    bucket = _buckets.get(urlsplit(url).netloc)
+    if bucket is not None:
+        bucket.acquire()
@@ -0,0 +1,94 @@
+"""数据源注册表 - 每个数据源的采集函数、默认参数、超时与并发类别
+
+名称、记录字段等元数据在 common/sources.py（存储和分析模块只依赖那里）；
+这里按 key 补上采集相关的字段，合并成 SOURCES，main.py 遍历它运行采集。
+
+字段说明（元数据字段见 common/sources.py）：
+    fetch: 采集函数
+    kwargs: 调用采集函数的参数
+    timeout: 该数据源的超时秒数（包括重试）
+    retries: 失败或空结果后的重试次数（默认 DEFAULT_RETRIES）
+    kind: 并发类别，"http" 或 "browser"（浏览器任务占用大量内存，同一时间只运行一个）
+"""
+
+from common.sources import SOURCES as SOURCE_METADATA
+from common.sources import to_records
+
+from .chrome_extensions import fetch_chrome_extensions
+from .github_trending import fetch_trending_repos
+from .hackernews import fetch_hackernews_posts
+from .product_hunt import fetch_product_hunt_posts
+from .theresanaiforthat import fetch_ai_tools
+from .toolify import fetch_toolify_tools
+
+
+# 每种并发类别同时运行的任务上限
+CONCURRENCY_LIMITS = {
+    "http": None,  # 不限
+    "browser": 1,
+}
+
+# 失败或空结果后的默认重试次数，以及重试退避基数（秒）
+DEFAULT_RETRIES = 1
+RETRY_BACKOFF = 2.0
+
+COLLECTORS = {
+    "product_hunt": {
+        "fetch": fetch_product_hunt_posts,
+        "kwargs": {"limit": 5},
+        "timeout": 30,
+        "kind": "http",
+    },
+    "toolify": {
+        "fetch": fetch_toolify_tools,
+        "kwargs": {"limit": 5},
+        "timeout": 120,
+        "retries": 0,
+        "kind": "browser",
+    },
+    "ai_tools": {
+        "fetch": fetch_ai_tools,
+        # 大批量增量采集：翻页直到遇到之前几天已存储的工具，全部存储，报告只展示前几个
+        "kwargs": {"limit": 300, "max_pages": 10, "incremental": True},
+        "timeout": 60,
+        "kind": "http",
+    },
+    "chrome_extensions": {
+        "fetch": fetch_chrome_extensions,
+        "kwargs": {"limit": 5, "fan_out": True},
+        "timeout": 60,
+        "kind": "http",
+    },
+    "github_trending": {
+        "fetch": fetch_trending_repos,
+        "kwargs": {"limit": 5},
+        "timeout": 30,
+        "kind": "http",
+    },
+    "hacker_news": {
+        "fetch": fetch_hackernews_posts,
+        "kwargs": {"limit": 5, "feeds": ("top", "new", "best", "show", "ask")},
+        "timeout": 30,
+        "kind": "http",
+    },
+}
+
+# 元数据 + 采集字段，顺序与 common/sources.py 一致
+SOURCES = [dict(source, **COLLECTORS[source["key"]]) for source in SOURCE_METADATA]
+
+
+def build_jobs(sources=None):
+    """根据注册表生成 runner.run_collectors 的任务列表"""
+    return [
+        {
+            "key": source["key"],
+            "func": source["fetch"],
+            "kwargs": dict(source.get("kwargs", {})),
+            "timeout": source["timeout"],
+            "kind": source["kind"],
+            "retries": source.get("retries", DEFAULT_RETRIES),
+            "backoff": RETRY_BACKOFF,
+            "is_empty": lambda data, source=source: not to_records(source, data),
+        }
+        for source in (SOURCES if sources is None else sources)
+    ]
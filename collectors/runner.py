@@ -0,0 +1,123 @@
+"""并发采集调度器 - 所有数据源同时采集，每个数据源独立超时与重试"""
+
+import random
+import threading
+import time
+
+from . import budget
+
+
+# 重试退避的抖动使用独立随机源，不影响录制/回放时固定种子的全局 random
+_jitter = random.Random()
+
+
+def _call(job, slot):
+    if slot is not None:
+        with slot:
+            return job["func"](**job.get("kwargs", {}))
+    return job["func"](**job.get("kwargs", {}))
+
+
+def _run_job(job, outcome, deadline, slot=None):
+    """
+    在线程中执行单个采集任务，把结果或错误写入 outcome
+
+    抛出异常或结果为空（job["is_empty"]）都算失败，按 job["retries"] 重试，
+    第 n 次重试前等待 [0, backoff * 2^(n-1)) 秒之间的随机时长（full jitter），
+    等待后会超过截止时间时不再重试。
+    """
+    start = time.monotonic()
+    attempts = job.get("retries", 0) + 1
+    backoff = job.get("backoff", 1.0)
+    is_empty = job.get("is_empty", lambda data: not data)
+
+    for attempt in range(1, attempts + 1):
+        try:
+            data = _call(job, slot)
+            error = "空结果" if is_empty(data) else None
+        except Exception as e:
+            data = None
+            error = f"{type(e).__name__}: {e}"
+
+        if error is None or attempt == attempts:
+            break
+        delay = _jitter.uniform(0, backoff * 2 ** (attempt - 1))
+        if time.monotonic() + delay >= deadline:
+            break
+        print(f"  - {job['key']}: 第 {attempt} 次失败（{error}），{delay:.1f}s 后重试")
+        time.sleep(delay)
+
+    outcome.update({
+        "data": data,
+        "error": error,
+        "elapsed": time.monotonic() - start,
+        "attempts": attempt,
+    })
+
+
+def run_collectors(jobs, default_timeout=90, limits=None):
+    """
+    并发运行所有采集任务，整体耗时由最慢的数据源决定
+
+    每个任务在独立的守护线程中运行，超时的任务不会阻塞其他任务，
+    也不会阻止进程退出。设置了运行截止时间（budget.set_deadline）时，
+    任何任务都不会等到截止时间之后，报告使用截止前已返回的结果。
+
+    Args:
+        jobs: 任务列表，每项为 dict:
+            key: 数据源标识
+            func: 采集函数
+            kwargs: 传给采集函数的参数（可选）
+            timeout: 该数据源的超时秒数（可选），包括所有重试
+            kind: 并发类别（可选），配合 limits 使用
+            retries: 失败后的重试次数（可选，默认 0）
+            backoff: 重试退避基数秒数（可选，默认 1.0）
+            is_empty: 判断结果为空的函数（可选，默认 not data），空结果按失败重试
+        default_timeout: 未指定 timeout 时的默认超时（秒）
+        limits: {kind: 同时运行的任务上限}，None 表示不限；
+            排队等待的时间计入该任务的超时
+
+    Returns:
+        dict: {key: {"data": 采集结果或None, "error": 错误信息或None,
+                     "elapsed": 耗时秒数, "attempts": 尝试次数}}
+    """
+    results = {}
+    running = []
+    slots = {
+        kind: threading.Semaphore(limit)
+        for kind, limit in (limits or {}).items()
+        if limit is not None
+    }
+
+    start = time.monotonic()
+    run_left = budget.remaining()
+    for job in jobs:
+        outcome = {}
+        timeout = job.get("timeout", default_timeout)
+        if run_left is not None and run_left < timeout:
+            timeout = run_left
+        deadline = start + timeout
+        thread = threading.Thread(
+            target=_run_job,
+            args=(job, outcome, deadline, slots.get(job.get("kind"))),
+            name=f"collector-{job['key']}",
+            daemon=True,
+        )
+        thread.start()
+        running.append((deadline, timeout, job, thread, outcome))
+
+    # 按截止时间顺序等待，每个任务只等到自己的截止时间
+    # 超时线程之后写入的结果会被丢弃，不会覆盖已判定的超时
+    for deadline, timeout, job, thread, outcome in sorted(running, key=lambda r: r[0]):
+        thread.join(max(0.0, deadline - time.monotonic()))
+        if not thread.is_alive():
+            results[job["key"]] = outcome
+        else:
+            results[job["key"]] = {
+                "data": None,
+                "error": f"超时（{timeout:.0f}秒）",
+                "elapsed": time.monotonic() - start,
+                "attempts": None,
+            }
+
+    return results
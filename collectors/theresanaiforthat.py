@@ -1,37 +1,124 @@
 """There's An AI For That 采集器"""
 
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from zoneinfo import ZoneInfo
+
 import requests
-from bs4 import BeautifulSoup
 
+from storage.data_store import load_known_names
+
+from . import http
+from .parsing import make_soup, strainer
+
+
+# 列表页地址：/new/ 为最新上传（按时间倒序），分类页按任务分类
+NEW_URL = "https://theresanaiforthat.com/new/"
+NEW_PAGE_URL = "https://theresanaiforthat.com/new/page/{page}/"
+CATEGORY_URL = "https://theresanaiforthat.com/task/{slug}/"
+
+# 只解析带 data-name 属性的工具卡片
+TOOL_CARD_STRAINER = strainer(attrs={"data-name": True})
 
-HEADERS = {
-    "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
-    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
-    "Accept-Language": "en-US,en;q=0.5",
-    "Connection": "keep-alive",
-}
 
+def fetch_ai_tools(limit=5, max_pages=1, categories=None, incremental=False,
+                   history_days=28, max_concurrency=4):
+    """
+    获取 There's An AI For That 网站最新上传的AI工具
+
+    默认只读取 /new/ 第一页。大批量采集时可以翻页并追加分类页：
+    /new/ 各页按批并发请求（共享 http 连接池），按页面顺序合并、按链接去重。
+
+    Args:
+        limit: 返回的工具数上限
+        max_pages: 最多读取的 /new/ 页数
+        categories: 额外读取的分类 slug 列表（每个分类读第一页）
+        incremental: True 时遇到历史数据中已有的工具即停止翻页（不含当天的数据，
+            同一天重复运行得到相同的结果）
+        history_days: incremental 模式下参考的历史天数
+        max_concurrency: 同时请求的页面数
+
+    Returns:
+        list: 工具列表，/new/ 的结果在前
+    """
+    known = set()
+    if incremental:
+        today = datetime.now(ZoneInfo("America/Los_Angeles")).strftime("%Y-%m-%d")
+        known = load_known_names("ai_tools", days=history_days, before=today)
+
+    tools = []
+    seen_links = set()
 
-def fetch_ai_tools(limit=5):
-    """获取 There's An AI For That 网站最新上传的AI工具"""
-    # /new/ 页面 - 最新上传的工具
-    url = "https://theresanaiforthat.com/new/"
+    def add(page_tools):
+        """按顺序加入新工具；incremental 模式下遇到已知工具返回 True"""
+        for tool in page_tools:
+            if tool["name"] in known:
+                return True
+            if tool["link"] in seen_links:
+                continue
+            seen_links.add(tool["link"])
+            tools.append(tool)
+            if len(tools) >= limit:
+                return True
+        return False
 
+    # /new/ 按时间倒序，按批并发翻页，遇到已知工具或凑够数量即停止
+    page_urls = [_new_page_url(page) for page in range(1, max_pages + 1)]
+    with ThreadPoolExecutor(max_workers=max(1, min(max_concurrency, len(page_urls)))) as executor:
+        stopped = False
+        for start in range(0, len(page_urls), max_concurrency):
+            batch = page_urls[start:start + max_concurrency]
+            for page_tools in executor.map(_fetch_listing, batch):
+                if page_tools is None or add(page_tools):
+                    stopped = True
+                    break
+            if stopped:
+                break
+
+        # 分类页不按时间排序，不参与增量停止，只做补充
+        category_urls = [CATEGORY_URL.format(slug=slug) for slug in categories or []]
+        if category_urls and len(tools) < limit:
+            known = set()
+            for page_tools in executor.map(_fetch_listing, category_urls):
+                if page_tools and add(page_tools):
+                    break
+
+    return tools[:limit]
+
+
+def _new_page_url(page):
+    return NEW_URL if page == 1 else NEW_PAGE_URL.format(page=page)
+
+
+def _fetch_listing(url):
+    """
+    获取并解析一个列表页
+
+    Returns:
+        list: 页面中的全部有效工具；请求失败返回None
+    """
     try:
-        response = requests.get(url, headers=HEADERS, timeout=15)
+        response = http.get(url, timeout=15, cache=True)
         response.raise_for_status()
     except requests.RequestException as e:
         print(f"请求失败: {e}")
-        return []
+        return None
+
+    return _parse_tools(response.text)
+
 
-    soup = BeautifulSoup(response.text, "html.parser")
+def _parse_tools(html, limit=None):
+    """解析列表页的工具卡片，limit 为 None 时返回全部"""
+    soup = make_soup(html, parse_only=TOOL_CARD_STRAINER)
     tools = []
 
     # 查找工具卡片 - /new/ 页面用 data-name 属性
-    tool_cards = soup.select(".li[data-name]")[:limit * 3]
+    tool_cards = soup.select(".li[data-name]")
+    if limit is not None:
+        tool_cards = tool_cards[:limit * 3]
 
     for card in tool_cards:
-        if len(tools) >= limit:
+        if limit is not None and len(tools) >= limit:
             break
 
         # 从 data 属性获取信息
@@ -1,47 +1,102 @@
 """Toolify.ai 采集器 - 最新工具(new) + Trending工具"""
 
-import time
-from playwright.sync_api import sync_playwright, TimeoutError as PlaywrightTimeoutError
+from pathlib import Path
+from urllib.parse import urlsplit
 
+import requests
 
-def _get_page_html(url, wait_seconds=8):
-    """使用 Playwright 绕过 Cloudflare 获取页面 HTML"""
+from . import cassette, http
+from .browser import (
+    USER_AGENT, cookies_for, fetch_pages_html, load_storage_state, touch_storage_state,
+)
+from .parsing import make_soup, strainer
+
+
+NEW_URL = "https://www.toolify.ai/new"
+TRENDING_URL = "https://www.toolify.ai/Best-trending-AI-Tools"
+
+# 页面内容就绪的标志元素
+READY_SELECTORS = {
+    NEW_URL: ".tool-item[data-handle]",
+    TRENDING_URL: "tr.el-table__row",
+}
+
+# 只解析工具卡片 / 表格行
+NEW_TOOLS_STRAINER = strainer(class_="tool-item")
+TRENDING_STRAINER = strainer("tr", class_="el-table__row")
+
+# 等待 Cloudflare 验证 + 内容渲染的最长秒数
+MAX_WAIT_SECONDS = 15
+
+# 浏览器存储状态（含 Cloudflare clearance cookie），跨运行复用
+STATE_PATH = Path(__file__).parent.parent / "data" / "cache" / "toolify_state.json"
+
+
+def _get_direct_html(url, state):
+    """
+    用保存的 cookies 直接发 HTTP 请求，页面已包含目标内容才返回
+
+    clearance cookie 与 User-Agent 绑定，所以必须使用与浏览器相同的 UA。
+    """
+    cookies = cookies_for(state, urlsplit(url).hostname)
+    if not cookies:
+        return ""
     try:
-        with sync_playwright() as p:
-            browser = p.chromium.launch(
-                headless=True,
-                args=["--no-sandbox", "--disable-blink-features=AutomationControlled"],
-            )
-            context = browser.new_context(
-                user_agent=(
-                    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
-                    "AppleWebKit/537.36 (KHTML, like Gecko) "
-                    "Chrome/120.0.0.0 Safari/537.36"
-                ),
-                viewport={"width": 1280, "height": 800},
-            )
-            page = context.new_page()
-            page.add_init_script(
-                "Object.defineProperty(navigator, 'webdriver', {get: () => undefined})"
-            )
-            page.goto(url, timeout=30000, wait_until="domcontentloaded")
-            time.sleep(wait_seconds)  # 等待 Cloudflare 验证完成
-            html = page.content()
-            browser.close()
-            return html
-    except PlaywrightTimeoutError as e:
-        print(f"    页面加载超时: {e}")
+        response = http.get(url, headers={"User-Agent": USER_AGENT}, cookies=cookies, timeout=10)
+    except requests.RequestException:
         return ""
-    except Exception as e:
-        print(f"    Playwright 错误: {e}")
+    if response.status_code != 200:
+        return ""
+    soup = make_soup(response.text)
+    if soup.select_one(READY_SELECTORS[url]) is None:
         return ""
+    return response.text
+
+
+def _get_pages_html(urls, max_wait=MAX_WAIT_SECONDS, **block_options):
+    """
+    获取多个页面 HTML：先用保存的 cookies 直接请求，失败的页面再走浏览器
+
+    Args:
+        urls: 页面地址列表
+        max_wait: 等待内容就绪的最长秒数
+        **block_options: 传给 fetch_pages_html 的资源拦截参数
+            （block / blocked_types / blocked_hosts / allowed_hosts）
+
+    Returns:
+        dict: {url: html}
+    """
+    pages = {}
+    # 录制/回放时固定走浏览器路径，保证回放结果与录制一致
+    state = None if cassette.is_active() else load_storage_state(STATE_PATH)
+    if state:
+        for url in urls:
+            html = _get_direct_html(url, state)
+            if html:
+                pages[url] = html
+        if pages:
+            # cookies 仍然有效，刷新保存时间，避免状态文件按时间过期后重新走浏览器
+            touch_storage_state(STATE_PATH)
+
+    remaining = [url for url in urls if url not in pages]
+    if remaining:
+        pages.update(fetch_pages_html(
+            remaining, READY_SELECTORS, max_wait=max_wait, state_path=STATE_PATH,
+            **block_options,
+        ))
+    else:
+        print("    使用已保存的 Cloudflare cookies 直接获取，跳过浏览器")
+    return pages
+
+
+def _get_page_html(url, max_wait=MAX_WAIT_SECONDS):
+    """使用 Playwright 绕过 Cloudflare 获取单个页面 HTML"""
+    return _get_pages_html([url], max_wait=max_wait)[url]
 
 
 def _parse_new_tools(html, limit):
     """解析 /new 页面（卡片结构）"""
-    from bs4 import BeautifulSoup
-
-    soup = BeautifulSoup(html, "html.parser")
+    soup = make_soup(html, parse_only=NEW_TOOLS_STRAINER)
     tools = []
 
     items = [i for i in soup.select(".tool-item") if i.get("data-advertisement_id") == ""]
@@ -88,9 +143,7 @@ def _parse_trending(html, limit):
 
     列顺序：Ranking | Tools | Monthly Visit | Visit Change | Growth Rate | Description | Categories
     """
-    from bs4 import BeautifulSoup
-
-    soup = BeautifulSoup(html, "html.parser")
+    soup = make_soup(html, parse_only=TRENDING_STRAINER)
     tools = []
 
     rows = soup.select("tr.el-table__row")
@@ -134,7 +187,7 @@ def _parse_trending(html, limit):
 def fetch_new_tools(limit=5):
     """获取 Toolify.ai 最新上线的 AI 工具"""
     try:
-        html = _get_page_html("https://www.toolify.ai/new")
+        html = _get_page_html(NEW_URL)
         if not html:
             return []
         return _parse_new_tools(html, limit)
@@ -146,7 +199,7 @@ def fetch_new_tools(limit=5):
 def fetch_trending_tools(limit=5):
     """获取 Toolify.ai Trending AI 工具"""
     try:
-        html = _get_page_html("https://www.toolify.ai/Best-trending-AI-Tools")
+        html = _get_page_html(TRENDING_URL)
         if not html:
             return []
         return _parse_trending(html, limit)
@@ -155,14 +208,37 @@ def fetch_trending_tools(limit=5):
         return []
 
 
-def fetch_toolify_tools():
-    """获取 Toolify.ai 数据：new（最新）在前，trending在后"""
-    print("  正在获取 Toolify.ai 最新工具(new)...")
-    new = fetch_new_tools(5)
+def fetch_toolify_tools(limit=5, block=True, blocked_types=None, blocked_hosts=None,
+                        allowed_hosts=None):
+    """获取 Toolify.ai 数据：new（最新）在前，trending在后
+
+    两个页面在同一个浏览器中并行加载，只启动一次 Chromium。
+    block / blocked_types / blocked_hosts / allowed_hosts 控制浏览器的资源拦截，
+    默认值见 collectors/browser.py。
+    """
+    print("  正在获取 Toolify.ai 最新工具(new) + Trending 工具...")
+    pages = _get_pages_html(
+        [NEW_URL, TRENDING_URL],
+        block=block,
+        blocked_types=blocked_types,
+        blocked_hosts=blocked_hosts,
+        allowed_hosts=allowed_hosts,
+    )
+
+    new = []
+    try:
+        if pages[NEW_URL]:
+            new = _parse_new_tools(pages[NEW_URL], limit)
+    except Exception as e:
+        print(f"解析最新工具失败: {e}")
     print(f"  获取到 {len(new)} 个最新工具")
 
-    print("  正在获取 Toolify.ai Trending 工具...")
-    trending = fetch_trending_tools(5)
+    trending = []
+    try:
+        if pages[TRENDING_URL]:
+            trending = _parse_trending(pages[TRENDING_URL], limit)
+    except Exception as e:
+        print(f"解析 Trending 工具失败: {e}")
     print(f"  获取到 {len(trending)} 个 Trending 工具")
 
     return {
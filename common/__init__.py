@@ -0,0 +1,14 @@
+"""采集、存储、分析共用的定义 - 不依赖任何采集器，导入时不会加载 Playwright 等重量级依赖"""
+
+from .keywords import STOP_WORDS, extract_keywords
+from .sources import SOURCES, SOURCE_KEYS, for_report, get_source, to_records
+
+__all__ = [
+    "STOP_WORDS",
+    "extract_keywords",
+    "SOURCES",
+    "SOURCE_KEYS",
+    "for_report",
+    "get_source",
+    "to_records",
+]
@@ -0,0 +1,53 @@
+"""关键词提取 - 周报分析和周/月汇总共用"""
+
+import re
+from collections import defaultdict
+
+
+# 停用词列表
+STOP_WORDS = {
+    "the", "a", "an", "for", "with", "and", "or", "to", "of", "in", "on", "at",
+    "is", "it", "be", "as", "by", "this", "that", "from", "your", "you", "we",
+    "our", "all", "any", "can", "has", "have", "will", "more", "most", "new",
+    "one", "two", "using", "use", "used", "into", "are", "was", "been", "being",
+    "their", "them", "they", "what", "when", "where", "which", "who", "how",
+    "just", "like", "make", "get", "also", "its", "about", "than", "then",
+    "only", "other", "such", "some", "each", "every", "but", "not", "no",
+}
+
+
+def extract_keywords(items, top_n=10):
+    """
+    从产品名称和描述中提取关键词
+
+    Args:
+        items: 产品列表
+        top_n: 返回前N个关键词
+
+    Returns:
+        list: [(keyword, count), ...]
+    """
+    word_count = defaultdict(int)
+
+    # 提取文本字段
+    text_fields = ["name", "title", "description", "tagline"]
+
+    for item in items:
+        text_parts = []
+        for field in text_fields:
+            if field in item and item[field]:
+                text_parts.append(str(item[field]))
+
+        text = " ".join(text_parts)
+
+        # 提取单词（只保留英文字母）
+        words = re.findall(r"\b[a-zA-Z]{3,}\b", text)
+
+        for word in words:
+            word_lower = word.lower()
+            if word_lower not in STOP_WORDS:
+                word_count[word_lower] += 1
+
+    # 排序并返回Top N
+    sorted_words = sorted(word_count.items(), key=lambda x: -x[1])
+    return sorted_words[:top_n]
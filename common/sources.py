@@ -0,0 +1,111 @@
+"""数据源元数据 - 每个数据源的名称、记录字段与存储/分析用到的属性
+
+存储、分析和查询模块只需要这些元数据，从这里导入，不会加载采集器；
+采集函数、默认参数、超时和并发类别见 collectors/registry.py，按 key 与这里对应。
+新增数据源时两处各加一项。
+
+字段说明：
+    key: 数据源标识，也是每日数据 JSON 中的字段名
+    label: 显示名称
+    unit: 日志中的计数单位
+    schema: 每条记录的字段（搜索索引按此选择标语、描述和链接字段）
+    name_key: 用于跨天去重/匹配的字段
+    indie_key: Indie 分析中使用的数据源名称
+    empty: 采集失败时使用的空结果
+    flatten: 把采集结果转换为记录列表（默认原样返回）
+    report_limit: 报告中展示的条数（默认全部）；采集并存储的条数可以更多
+"""
+
+
+def _flatten_toolify(data):
+    """Toolify 返回 {"new": [...], "trending": [...]}，存储时合并为一个列表"""
+    if isinstance(data, list):
+        return data
+    return data.get("new", []) + data.get("trending", [])
+
+
+SOURCES = [
+    {
+        "key": "product_hunt",
+        "label": "Product Hunt",
+        "unit": "个产品",
+        "schema": ("name", "tagline", "link"),
+        "name_key": "name",
+        "indie_key": "product_hunt",
+        "empty": list,
+    },
+    {
+        "key": "toolify",
+        "label": "Toolify Trending",
+        "unit": "个工具",
+        "schema": ("name", "description", "category", "monthly_visit", "growth_rate", "link"),
+        "name_key": "name",
+        "indie_key": "toolify",
+        "empty": lambda: {"new": [], "trending": []},
+        "flatten": _flatten_toolify,
+    },
+    {
+        "key": "ai_tools",
+        "label": "There's An AI For That",
+        "unit": "个工具",
+        "schema": ("name", "description", "category", "link"),
+        "name_key": "name",
+        "indie_key": "ai_tools",
+        "empty": list,
+        "report_limit": 5,
+    },
+    {
+        "key": "chrome_extensions",
+        "label": "Chrome Extensions",
+        "unit": "个扩展",
+        "schema": ("name", "description", "users", "rating", "link"),
+        "name_key": "name",
+        "indie_key": "chrome_extensions",
+        "empty": list,
+    },
+    {
+        "key": "github_trending",
+        "label": "GitHub Trending",
+        "unit": "个项目",
+        "schema": ("name", "description", "today_stars", "stars_today", "period_stars",
+                   "stars", "forks", "language", "since", "scopes"),
+        "name_key": "name",
+        "indie_key": "github",
+        "empty": list,
+    },
+    {
+        "key": "hacker_news",
+        "label": "Hacker News",
+        "unit": "个热门",
+        "schema": ("id", "title", "author", "score", "comments", "url", "feeds"),
+        "name_key": "title",
+        "indie_key": "hackernews",
+        "empty": list,
+    },
+]
+
+SOURCE_KEYS = [source["key"] for source in SOURCES]
+
+
+def get_source(key):
+    """按 key 查找数据源，不存在时抛出 KeyError"""
+    for source in SOURCES:
+        if source["key"] == key:
+            return source
+    raise KeyError(key)
+
+
+def for_report(source, data):
+    """报告使用的数据：列表结果只保留前 report_limit 条"""
+    limit = source.get("report_limit")
+    if limit is None or not isinstance(data, list):
+        return data
+    return data[:limit]
+
+
+def to_records(source, data):
+    """把采集结果转换为存储用的记录列表"""
+    if not data:
+        return []
+    flatten = source.get("flatten")
+    return flatten(data) if flatten else data
@@ -2,144 +2,187 @@
 """AI/Tech 趋势监控工具"""
 
 import argparse
-import os
+import random
+import time
 from datetime import datetime
+from pathlib import Path
 from zoneinfo import ZoneInfo
 
-from collectors import fetch_trending_repos, fetch_product_hunt_posts, fetch_hackernews_posts, fetch_ai_tools, fetch_chrome_extensions
-from collectors.toolify import fetch_toolify_tools
+from collectors import budget, cassette, circuit, http
+from collectors.registry import CONCURRENCY_LIMITS, SOURCES, build_jobs, to_records
+from common.sources import for_report
+from collectors.runner import run_collectors
 from reporters import generate_markdown_report
 from reporters.html_generator import generate_html_report
 from analyzers.indie_analyzer import generate_indie_report
 from analyzers.indie_html_generator import generate_indie_html
 from senders import send_email_report
-from storage import save_daily_data
+from storage import save_daily_data, storage_path
+
+
+def _lap(timings, stage, start):
+    """记录一个阶段的耗时，返回下一阶段的起点"""
+    now = time.monotonic()
+    timings.append((stage, now - start))
+    return now
 
 
 def main():
     # 解析命令行参数
     parser = argparse.ArgumentParser(description="AI/Tech 趋势监控工具")
     parser.add_argument("--no-email", action="store_true", help="跳过发送邮件")
+    parser.add_argument("--cache-ttl", type=int, default=0,
+                        help="HTTP 缓存新鲜期（秒），期限内直接使用 data/cache/ 中的响应，适合本地重复运行")
+    parser.add_argument("--deadline", type=int, default=240,
+                        help="采集阶段的总时间预算（秒），到时使用已返回的数据生成报告；0 表示不限")
+    cassette_group = parser.add_mutually_exclusive_group()
+    cassette_group.add_argument("--record", metavar="DIR", help="录制所有 HTTP 响应和浏览器页面到 DIR")
+    cassette_group.add_argument("--replay", metavar="DIR", help="从 DIR 回放录制内容，不联网、不启动浏览器")
     args = parser.parse_args()
 
-    print("正在采集数据...")
-
-    # 采集Product Hunt
-    print("  - 抓取 Product Hunt...")
-    product_hunt_data = fetch_product_hunt_posts(limit=5)
-    print(f"    获取到 {len(product_hunt_data)} 个产品")
-
-    # 采集Toolify Trending
-    print("  - 抓取 Toolify Trending...")
-    toolify_data = fetch_toolify_tools()
-    print(f"    获取到 {len(toolify_data)} 个工具")
-
-    # 采集There's An AI For That
-    print("  - 抓取 There's An AI For That...")
-    ai_tools_data = fetch_ai_tools(limit=5)
-    print(f"    获取到 {len(ai_tools_data)} 个工具")
-
-    # 采集Chrome Extensions
-    print("  - 抓取 Chrome Extensions...")
-    chrome_extensions_data = fetch_chrome_extensions(limit=5)
-    print(f"    获取到 {len(chrome_extensions_data)} 个扩展")
-
-    # 采集GitHub Trending
-    print("  - 抓取 GitHub Trending...")
-    github_trending_data = fetch_trending_repos(limit=5)
-    print(f"    获取到 {len(github_trending_data)} 个项目")
-
-    # 采集Hacker News
-    print("  - 抓取 Hacker News...")
-    hackernews_data = fetch_hackernews_posts(limit=5)
-    print(f"    获取到 {len(hackernews_data)} 个热门")
+    http.configure(cache_ttl=args.cache_ttl)
+
+    if args.record or args.replay:
+        # 固定随机种子，回放时选择的搜索关键词与录制时一致
+        random.seed(0)
+        if args.record:
+            cassette.start_recording(args.record)
+            print(f"🎙️  录制模式：{args.record}")
+        else:
+            cassette.start_replay(args.replay)
+            print(f"▶️  回放模式：{args.replay}")
+
+    # 录制/回放只用于基准测试：报告写入 cassette 目录，不存储数据、不发邮件
+    out_dir = cassette.output_dir() or Path(".")
+    if cassette.is_active():
+        print(f"   报告输出到 {out_dir}，不存储每日数据、不发送邮件")
+
+    timings = []
+    stage_start = time.monotonic()
+
+    if args.deadline > 0:
+        budget.set_deadline(args.deadline)
+
+    # 熔断器：连续失败的数据源本次直接跳过（录制/回放时不使用，保证结果可重复）
+    use_circuit = not cassette.is_active()
+    circuit_state = circuit.load_state() if use_circuit else {}
+    active_sources = [
+        source for source in SOURCES
+        if not (use_circuit and circuit.should_skip(circuit_state, source["key"]))
+    ]
+
+    print("正在采集数据（并发）...")
+    collect_start = time.monotonic()
+    results = run_collectors(build_jobs(active_sources), limits=CONCURRENCY_LIMITS)
+
+    # 失败、超时或被熔断的数据源按空数据处理，报告照常生成并标出缺失的数据源
+    collected = {}
+    missing = {}
+    for source in SOURCES:
+        result = results.get(source["key"])
+        if result is None:
+            failures = circuit_state[source["key"]]["failures"]
+            missing[source["label"]] = f"已连续失败 {failures} 次，本次跳过"
+            print(f"  - {source['label']}: ⏭️  熔断跳过（连续失败 {failures} 次）")
+            collected[source["key"]] = source["empty"]()
+            continue
+
+        if result["error"]:
+            missing[source["label"]] = result["error"]
+            print(f"  - {source['label']}: ❌ {result['error']}（{result['elapsed']:.1f}s）")
+        else:
+            count = len(to_records(source, result["data"]))
+            print(f"  - {source['label']}: 获取到 {count} {source['unit']}（{result['elapsed']:.1f}s）")
+        if use_circuit:
+            circuit.record(circuit_state, source["key"], result["error"] is None, result["error"])
+        collected[source["key"]] = result["data"] or source["empty"]()
+    print(f"  采集总耗时 {time.monotonic() - collect_start:.1f}s")
+
+    if use_circuit:
+        circuit.save_state(circuit_state)
+
+    stage_start = _lap(timings, "采集", stage_start)
 
     # 生成报告
     print("正在生成报告...")
-    report = generate_markdown_report(
-        github_trending_data,
-        product_hunt_data,
-        hackernews_data,
-        ai_tools_data,
-        chrome_extensions_data,
-        toolify_data,
-    )
+    # 全部采集结果都会存储，报告只展示每个数据源的前 report_limit 条
+    report_data = {
+        source["key"]: for_report(source, collected[source["key"]])
+        for source in SOURCES
+    }
+    report = generate_markdown_report(report_data, missing=missing)
 
     # 写入文件
-    with open("report.md", "w", encoding="utf-8") as f:
+    out_dir.mkdir(parents=True, exist_ok=True)
+    report_path = out_dir / "report.md"
+    with open(report_path, "w", encoding="utf-8") as f:
         f.write(report)
 
-    print("✅ 报告已生成：report.md")
+    print(f"✅ 报告已生成：{report_path}")
+    stage_start = _lap(timings, "Markdown 报告", stage_start)
 
     # 生成HTML报告
-    html_report = generate_html_report(
-        product_hunt_data,
-        toolify_data,
-        ai_tools_data,
-        chrome_extensions_data,
-        github_trending_data,
-        hackernews_data,
-    )
-    os.makedirs("docs", exist_ok=True)
-    with open("docs/index.html", "w", encoding="utf-8") as f:
+    html_report = generate_html_report(report_data, missing=missing)
+    docs_dir = out_dir / "docs"
+    docs_dir.mkdir(parents=True, exist_ok=True)
+    html_path = docs_dir / "index.html"
+    with open(html_path, "w", encoding="utf-8") as f:
         f.write(html_report)
 
-    print("✅ HTML report saved to docs/index.html")
+    print(f"✅ HTML report saved to {html_path}")
+    stage_start = _lap(timings, "HTML 报告", stage_start)
 
     # 存储每日数据
-    print("正在存储数据...")
     pst = ZoneInfo("America/Los_Angeles")
     today = datetime.now(pst).strftime("%Y-%m-%d")
-    daily_data = {
-        "product_hunt": product_hunt_data,
-        "toolify": toolify_data.get("new", []) + toolify_data.get("trending", []),
-        "ai_tools": ai_tools_data,
-        "chrome_extensions": chrome_extensions_data,
-        "github_trending": github_trending_data,
-        "hacker_news": hackernews_data,
-    }
-    if save_daily_data(today, daily_data):
-        print(f"✅ 数据已存储：data/daily/{today}.json")
+    if cassette.is_active():
+        print("⏭️  录制/回放模式，跳过数据存储")
     else:
-        print("⚠️  数据存储失败，继续执行...")
+        print("正在存储数据...")
+        daily_data = {
+            source["key"]: to_records(source, collected[source["key"]])
+            for source in SOURCES
+        }
+        if save_daily_data(today, daily_data):
+            print(f"✅ 数据已存储：{storage_path(today)}")
+        else:
+            print("⚠️  数据存储失败，继续执行...")
+    stage_start = _lap(timings, "存储", stage_start)
 
     # 生成 Indie Hacker 机会分析报告
     print("正在生成 Indie 分析报告...")
-    indie_report = generate_indie_report(
-        product_hunt_data,
-        toolify_data,
-        ai_tools_data,
-        chrome_extensions_data,
-        github_trending_data,
-        hackernews_data,
-    )
-    os.makedirs("analysis/daily", exist_ok=True)
-    indie_path = f"analysis/daily/{today}-indie.md"
+    indie_report = generate_indie_report(report_data)
+    indie_dir = out_dir / "analysis" / "daily"
+    indie_dir.mkdir(parents=True, exist_ok=True)
+    indie_path = indie_dir / f"{today}-indie.md"
     with open(indie_path, "w", encoding="utf-8") as f:
         f.write(indie_report)
     print(f"✅ Indie analysis saved to {indie_path}")
+    stage_start = _lap(timings, "Indie 报告", stage_start)
 
     # 生成 Indie HTML 报告
-    indie_product_data = {
-        "product_hunt": product_hunt_data,
-        "toolify": toolify_data,
-        "ai_tools": ai_tools_data,
-        "chrome_extensions": chrome_extensions_data,
-        "github": github_trending_data,
-        "hackernews": hackernews_data,
-    }
-    indie_html = generate_indie_html(indie_report, indie_product_data)
-    with open("docs/indie.html", "w", encoding="utf-8") as f:
+    indie_html = generate_indie_html(indie_report, report_data)
+    indie_html_path = docs_dir / "indie.html"
+    with open(indie_html_path, "w", encoding="utf-8") as f:
         f.write(indie_html)
-    print("✅ Indie HTML saved to docs/indie.html")
+    print(f"✅ Indie HTML saved to {indie_html_path}")
+    stage_start = _lap(timings, "Indie HTML", stage_start)
 
     # 发送邮件
-    if not args.no_email:
+    if cassette.is_active():
+        print("⏭️  录制/回放模式，跳过邮件发送")
+    elif not args.no_email:
         print("正在发送邮件...")
         if send_email_report(report):
             print("✅ 邮件发送成功")
     else:
         print("⏭️  跳过邮件发送")
+    _lap(timings, "邮件", stage_start)
+
+    print("各阶段耗时：")
+    for stage, elapsed in timings:
+        print(f"  - {stage}: {elapsed:.3f}s")
+    print(f"  总计: {sum(elapsed for _, elapsed in timings):.3f}s")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""历史数据全文搜索入口
+
+用法：
+    python query.py "voice agent"                 # 全部历史
+    python query.py "voice agent" --days 180      # 最近 6 个月
+    python query.py "voice OR speech" --source product_hunt
+"""
+
+import argparse
+import sqlite3
+import time
+from datetime import datetime, timedelta
+
+from common.sources import SOURCE_KEYS
+from storage import search_index
+from storage.data_store import sync_search_index
+
+
+def main():
+    # 解析命令行参数
+    parser = argparse.ArgumentParser(description="搜索历史采集数据（名称/标题、标语、描述）")
+    parser.add_argument("query", help="搜索词，支持 FTS5 语法：\"短语\"、OR、NOT、前缀*")
+    parser.add_argument("--days", type=int, help="只搜索最近N天（默认全部历史）")
+    parser.add_argument("--source", choices=SOURCE_KEYS, help="只搜索某个数据源")
+    parser.add_argument("--limit", type=int, default=20, help="最多显示多少条（默认20）")
+    args = parser.parse_args()
+
+    since = None
+    if args.days is not None:
+        since = (datetime.now() - timedelta(days=args.days)).strftime("%Y-%m-%d")
+
+    try:
+        conn = search_index.connect()
+    except sqlite3.OperationalError as e:
+        print(f"❌ 无法打开搜索索引（需要 SQLite FTS5）: {e}")
+        return
+
+    try:
+        # 首次使用或索引缺少已存储的日期时先补录
+        added = sync_search_index(conn)
+        if added:
+            print(f"已补录 {added} 天的数据到搜索索引")
+
+        # 索引只在本地缓存中，清理后的旧日期能否搜到取决于缓存保留了多久
+        earliest = search_index.earliest_date(conn)
+        if earliest and (since is None or since < earliest):
+            print(
+                f"⚠️  搜索索引只覆盖 {earliest} 之后的数据，更早的日期无法搜索；"
+                "长期历史见 data/rollups"
+            )
+
+        start = time.perf_counter()
+        hits = search_index.search(conn, args.query, since=since, source=args.source, limit=args.limit)
+        elapsed = (time.perf_counter() - start) * 1000
+    finally:
+        conn.close()
+
+    if not hits:
+        print(f"没有找到匹配 \"{args.query}\" 的记录（{elapsed:.1f}ms）")
+        return
+
+    print(f"找到 {len(hits)} 条匹配 \"{args.query}\" 的记录（{elapsed:.1f}ms）：")
+    for i, hit in enumerate(hits, 1):
+        seen = hit["last_seen"]
+        if hit["appearances"] > 1:
+            seen = f"{hit['first_seen']} ~ {hit['last_seen']}，出现 {hit['appearances']} 次"
+        print(f"{i:>3}. [{hit['source']}] {hit['name']}（{seen}）")
+        if hit["link"]:
+            print(f"     {hit['link']}")
+
+
+if __name__ == "__main__":
+    main()
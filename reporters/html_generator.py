@@ -4,25 +4,21 @@ from datetime import datetime
 from zoneinfo import ZoneInfo
 
 
-def generate_html_report(
-    product_hunt_data,
-    toolify_data,
-    ai_tools_data,
-    chrome_extensions_data,
-    github_trending_data,
-    hackernews_data,
-):
+def generate_html_report(collected, missing=None):
     """
     Generate a responsive dark-theme HTML report from all data sources.
 
     Args:
-        product_hunt_data: list of {name, tagline, link}
-        toolify_data: dict {'new': [{name, description, category, link}],
-                            'trending': [{name, description, monthly_visit, growth_rate, link}]}
-        ai_tools_data: list of {name, description, category, link}
-        chrome_extensions_data: list of {name, description, users, rating, link}
-        github_trending_data: list of {name, description, today_stars}
-        hackernews_data: list of {title, author, score, comments, url}
+        collected: dict keyed by source key (see common/sources.py):
+            product_hunt: list of {name, tagline, link}
+            toolify: dict {'new': [{name, description, category, link}],
+                           'trending': [{name, description, monthly_visit, growth_rate, link}]}
+            ai_tools: list of {name, description, category, link}
+            chrome_extensions: list of {name, description, users, rating, link}
+            github_trending: list of {name, description, today_stars}
+            hacker_news: list of {id, title, author, score, comments, url, feeds}
+        missing: dict {source label: reason} for sources that failed, timed out
+                 or were skipped by the circuit breaker; shown as a banner
 
     Returns:
         str: Complete HTML document
@@ -32,6 +28,13 @@ def generate_html_report(
     tz_abbr = now.strftime("%Z")
     date_str = now.strftime(f"%B %d, %Y · %H:%M {tz_abbr}")
 
+    product_hunt_data = collected.get("product_hunt") or []
+    toolify_data = collected.get("toolify")
+    ai_tools_data = collected.get("ai_tools") or []
+    chrome_extensions_data = collected.get("chrome_extensions") or []
+    github_trending_data = collected.get("github_trending") or []
+    hackernews_data = collected.get("hacker_news") or []
+
     toolify_new = toolify_data.get("new", []) if isinstance(toolify_data, dict) else []
     toolify_trending = toolify_data.get("trending", []) if isinstance(toolify_data, dict) else []
 
@@ -109,6 +112,18 @@ def generate_html_report(
             padding: 32px 16px 64px;
         }
 
+        .missing {
+            background: #2a1a0a;
+            border: 1px solid #7c4a12;
+            border-radius: 8px;
+            color: #fbd38d;
+            font-size: 14px;
+            margin-bottom: 24px;
+            padding: 12px 16px;
+        }
+
+        .missing ul { margin: 6px 0 0 20px; }
+
         .section {
             margin-bottom: 48px;
         }
@@ -361,6 +376,11 @@ def generate_html_report(
         + section("🔥", "#1a0a0a", "Hacker News", hn_html, len(hackernews_data))
     )
 
+    missing_html = ""
+    if missing:
+        items = "".join(f"<li>{e(label)}: {e(reason)}</li>" for label, reason in missing.items())
+        missing_html = f'<div class="missing">⚠️ Missing sources this run<ul>{items}</ul></div>'
+
     source_pills = "".join(
         f'<span class="pill">{s}</span>'
         for s in ["Product Hunt", "Toolify.ai", "TAAFT", "Chrome Extensions", "GitHub", "Hacker News"]
@@ -382,6 +402,7 @@ def generate_html_report(
         <div class="source-pills">{source_pills}</div>
     </div>
     <div class="container">
+        {missing_html}
         {sections_html}
     </div>
 </body>
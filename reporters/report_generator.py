@@ -4,8 +4,20 @@ from datetime import datetime
 from zoneinfo import ZoneInfo
 
 
-def generate_markdown_report(repos, products, hackernews_posts, ai_tools=None, chrome_extensions=None, toolify_tools=None):
-    """生成Markdown格式的报告"""
+def generate_markdown_report(collected, missing=None):
+    """
+    生成Markdown格式的报告
+
+    collected: {数据源 key: 采集结果}，key 见 common/sources.py
+    missing: {数据源名称: 原因}，本次失败、超时或被熔断跳过的数据源，在报告开头标出
+    """
+    products = collected.get("product_hunt") or []
+    toolify_tools = collected.get("toolify")
+    ai_tools = collected.get("ai_tools") or []
+    chrome_extensions = collected.get("chrome_extensions") or []
+    repos = collected.get("github_trending") or []
+    hackernews_posts = collected.get("hacker_news") or []
+
     pst = ZoneInfo("America/Los_Angeles")
     now = datetime.now(pst)
     tz_abbr = now.strftime("%Z")  # PST 或 PDT（自动处理夏令时）
@@ -16,6 +28,15 @@ def generate_markdown_report(repos, products, hackernews_posts, ai_tools=None, c
         "",
         f"**生成时间**: {timestamp}",
         "",
+    ]
+
+    if missing:
+        lines.append("> ⚠️ **以下数据源本次未获取到数据**：")
+        for label, reason in missing.items():
+            lines.append(f"> - {label}：{reason}")
+        lines.append("")
+
+    lines += [
         "---",
         "",
         "## Product Hunt 今日热门",
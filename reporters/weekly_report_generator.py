@@ -323,6 +323,9 @@ def _get_extra_info(source_key, item):
             return f"安装量: {users} | 评分: {rating}"
     elif source_key == "github_trending":
         stars = item.get("today_stars", "")
+        total = item.get("stars")
+        if stars and isinstance(total, int):
+            return f"热度: {stars} | 总Stars: {total:,}"
         if stars:
             return f"热度: {stars}"
     elif source_key == "hacker_news":
@@ -1,5 +1,5 @@
 """数据存储模块"""
 
-from .data_store import save_daily_data, cleanup_old_data
+from .data_store import save_daily_data, cleanup_old_data, query_items, storage_path
 
-__all__ = ["save_daily_data", "cleanup_old_data"]
+__all__ = ["save_daily_data", "cleanup_old_data", "query_items", "storage_path"]
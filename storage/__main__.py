@@ -0,0 +1,69 @@
+"""存储维护命令
+
+用法：
+    python -m storage import [--dir DIR] [--db FILE]   把 data/daily 中的数据批量导入 SQLite
+    python -m storage reindex                          从已存储的全部数据重建全文搜索索引
+    python -m storage migrate [--keep]                 把旧的每日 JSON 文件合并进月度 JSONL 段文件
+    python -m storage manifest                         重建数据集清单 data/manifest.json
+    python -m storage verify                           检查数据文件与清单是否一致
+"""
+
+import argparse
+import sys
+
+from common.sources import SOURCE_KEYS
+
+from . import search_index, segments, sqlite_store
+from .data_store import DATA_DIR, rebuild_manifest, rebuild_search_index, verify_data
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m storage", description="存储维护命令")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    import_parser = subparsers.add_parser("import", help="把 data/daily 中的数据批量导入 SQLite")
+    import_parser.add_argument("--dir", default=str(DATA_DIR), help="数据目录")
+    import_parser.add_argument("--db", default=str(sqlite_store.DB_PATH), help="数据库文件")
+
+    subparsers.add_parser("reindex", help="从已存储的全部数据重建全文搜索索引")
+
+    migrate_parser = subparsers.add_parser("migrate", help="把旧的每日 JSON 文件合并进月度 JSONL 段文件")
+    migrate_parser.add_argument("--dir", default=str(DATA_DIR), help="数据目录")
+    migrate_parser.add_argument("--keep", action="store_true", help="保留旧的 JSON 文件")
+
+    subparsers.add_parser("manifest", help="重建数据集清单")
+    subparsers.add_parser("verify", help="检查数据文件与清单是否一致")
+
+    args = parser.parse_args()
+
+    if args.command == "import":
+        conn = sqlite_store.connect(args.db)
+        try:
+            count = sqlite_store.import_json_dir(conn, args.dir, SOURCE_KEYS)
+        finally:
+            conn.close()
+        print(f"✅ 已导入 {count} 天的数据到 {args.db}")
+
+    elif args.command == "reindex":
+        print(f"✅ 已索引 {rebuild_search_index()} 天的数据到 {search_index.INDEX_PATH}")
+
+    elif args.command == "migrate":
+        count, bytes_before, bytes_after = segments.migrate(args.dir, keep=args.keep)
+        print(f"✅ 已迁移 {count} 天的数据：{bytes_before / 1024:.1f} KB → {bytes_after / 1024:.1f} KB")
+        rebuild_manifest()
+
+    elif args.command == "manifest":
+        print(f"✅ 清单已重建：{len(rebuild_manifest()['dates'])} 天")
+
+    elif args.command == "verify":
+        problems = verify_data()
+        if problems:
+            print(f"❌ 发现 {len(problems)} 个问题：")
+            for problem in problems:
+                print(f"  - {problem}")
+            sys.exit(1)
+        print("✅ 数据文件与清单一致")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,19 +1,126 @@
-"""每日数据存储"""
+"""每日数据存储
+
+默认按月追加到 JSONL 段文件（data/daily/YYYY-MM.jsonl，每行一天，见 storage/segments.py），
+旧的每日 JSON 文件（data/daily/YYYY-MM-DD.json）照常读取，可用 python -m storage migrate 转换。
+每次保存同时更新数据集清单（data/manifest.json，见 storage/manifest.py），
+列出日期、按范围加载都只读清单，不再遍历目录。
+设置环境变量 STORAGE_BACKEND=sqlite 时改用 SQLite（storage/sqlite_store.py），接口不变。
+"""
 
 import json
 import os
+import sqlite3
 from datetime import datetime, timedelta
 from pathlib import Path
 from zoneinfo import ZoneInfo
 
+from common.sources import SOURCE_KEYS, get_source
+
+from . import manifest, rollups, search_index, segments, sqlite_store
+
 
 # 数据存储目录
 DATA_DIR = Path(__file__).parent.parent / "data" / "daily"
 
+# 存储后端："json"（默认）或 "sqlite"
+STORAGE_BACKEND = os.environ.get("STORAGE_BACKEND", "json")
+
+# 快照结构版本，记录在清单中；快照字段发生不兼容变化时递增
+SCHEMA_VERSION = 1
+
+
+def _use_sqlite():
+    return STORAGE_BACKEND == "sqlite"
+
+
+def _counts(snapshot):
+    return {key: len(snapshot.get(key) or []) for key in SOURCE_KEYS}
+
+
+def _scan():
+    """遍历数据目录生成清单（段文件中的日期优先于同日期的旧 JSON 文件）"""
+    scanned = manifest.empty()
+    if not DATA_DIR.exists():
+        return scanned
+
+    for file_path in sorted(DATA_DIR.glob("*.json")):
+        try:
+            datetime.strptime(file_path.stem, "%Y-%m-%d")
+            content = file_path.read_bytes()
+            snapshot = json.loads(content)
+        except (ValueError, OSError):
+            continue
+        scanned["dates"][file_path.stem] = manifest.make_entry(
+            file_path.name, content, _counts(snapshot), SCHEMA_VERSION
+        )
+
+    for file_path in sorted(DATA_DIR.glob(f"*{segments.SEGMENT_SUFFIX}")):
+        for date, (line, snapshot) in segments.read_lines(file_path).items():
+            scanned["dates"][date] = manifest.make_entry(
+                file_path.name, line.encode("utf-8"), _counts(snapshot), SCHEMA_VERSION
+            )
+    return scanned
+
+
+def rebuild_manifest():
+    """
+    遍历数据目录重建清单（清单缺失、手动修改数据文件或迁移后使用）
+
+    Returns:
+        dict: 新清单
+    """
+    rebuilt = _scan()
+    manifest.save(rebuilt)
+    return rebuilt
+
+
+def _load_manifest():
+    """读取清单，不存在时从数据目录重建"""
+    return manifest.load() or rebuild_manifest()
+
+
+def _read_content(date, entry):
+    """读取某天快照在存储中的原始字节，不存在时返回 None"""
+    if entry["file"].endswith(segments.SEGMENT_SUFFIX):
+        line, _ = segments.find(DATA_DIR, date)
+        return None if line is None else line.encode("utf-8")
+    try:
+        return (DATA_DIR / entry["file"]).read_bytes()
+    except OSError:
+        return None
+
+
+def verify_data():
+    """
+    检查数据文件与清单是否一致
+
+    Returns:
+        list: 问题描述列表，为空表示一致
+    """
+    current = manifest.load()
+    if current is None:
+        return ["清单不存在或无法读取"]
+    problems = manifest.verify(current, _read_content)
+    for date in sorted(set(_scan()["dates"]) - set(current["dates"])):
+        problems.append(f"{date}: 数据文件中存在但未记录在清单中")
+    return problems
+
+
+def storage_path(date):
+    """
+    某一天的数据实际保存到的文件
+
+    Returns:
+        Path: 当月段文件（data/daily/YYYY-MM.jsonl），SQLite 后端时为数据库文件
+    """
+    if _use_sqlite():
+        return sqlite_store.DB_PATH
+    return segments.segment_path(DATA_DIR, date)
+
 
 def save_daily_data(date, data):
     """
-    保存每日采集的数据为JSON文件
+    保存每日采集的数据（写入 storage_path(date)，同一日期重复保存时替换）
 
     Args:
         date: 日期字符串，格式 YYYY-MM-DD
@@ -34,18 +141,29 @@ def save_daily_data(date, data):
         full_data = {
             "date": date,
             "timestamp": timestamp,
-            "product_hunt": data.get("product_hunt", []),
-            "toolify": data.get("toolify", []),
-            "ai_tools": data.get("ai_tools", []),
-            "chrome_extensions": data.get("chrome_extensions", []),
-            "github_trending": data.get("github_trending", []),
-            "hacker_news": data.get("hacker_news", []),
         }
+        for key in SOURCE_KEYS:
+            full_data[key] = data.get(key, [])
 
         # 保存文件
-        file_path = DATA_DIR / f"{date}.json"
-        with open(file_path, "w", encoding="utf-8") as f:
-            json.dump(full_data, f, ensure_ascii=False, indent=2)
+        if _use_sqlite():
+            conn = sqlite_store.connect()
+            try:
+                sqlite_store.save_snapshot(conn, full_data, SOURCE_KEYS)
+            finally:
+                conn.close()
+        else:
+            current = _load_manifest()
+            line = segments.save(DATA_DIR, full_data)
+            current["dates"][date] = manifest.make_entry(
+                segments.segment_path(DATA_DIR, date).name,
+                line.encode("utf-8"),
+                _counts(full_data),
+                SCHEMA_VERSION,
+            )
+            manifest.save(current)
+
+        _update_search_index(full_data)
 
         # 保存后清理旧数据
         cleanup_old_data(days=28)
@@ -57,36 +175,103 @@ def save_daily_data(date, data):
         return False
 
 
-def cleanup_old_data(days=28):
+def _update_search_index(snapshot):
+    """增量更新全文搜索索引，失败只打印警告，不影响数据存储"""
+    try:
+        conn = search_index.connect()
+        try:
+            search_index.index_snapshot(conn, snapshot)
+            sync_search_index(conn)
+        finally:
+            conn.close()
+    except sqlite3.Error as e:
+        print(f"    搜索索引更新失败: {e}")
+
+
+def sync_search_index(conn):
     """
-    清理指定天数之前的旧数据
+    把已存储但索引中没有的日期补进索引（索引新建、缓存丢失或之前更新失败后）
 
     Args:
-        days: 保留最近多少天的数据，默认28天（4周）
+        conn: search_index.connect() 返回的连接
+
+    Returns:
+        int: 补录的天数
+    """
+    missing = set(list_available_dates(days=None)) - search_index.indexed_dates(conn)
+    if not missing:
+        return 0
+    snapshots = load_daily_range(min(missing), max(missing))
+    count = 0
+    for date in sorted(missing & set(snapshots)):
+        search_index.index_snapshot(conn, snapshots[date])
+        count += 1
+    return count
+
+
+def rebuild_search_index():
+    """
+    从已存储的全部数据重建全文搜索索引
+
+    已被清理的日期不在存储中，重建后也会从索引中消失
+
+    Returns:
+        int: 索引的天数
     """
+    snapshots = load_daily_range()
+    conn = search_index.connect()
     try:
-        if not DATA_DIR.exists():
-            return
+        return search_index.rebuild(conn, (snapshots[date] for date in sorted(snapshots)))
+    finally:
+        conn.close()
+
+
+def cleanup_old_data(days=28):
+    """
+    清理指定天数之前的旧数据，删除前先汇总为周/月汇总（storage/rollups.py）
 
+    Args:
+        days: 保留完整每日数据的天数，默认28天（4周）
+    """
+    try:
         cutoff_date = datetime.now() - timedelta(days=days)
 
-        for file_path in DATA_DIR.glob("*.json"):
-            try:
-                # 从文件名提取日期
-                date_str = file_path.stem  # YYYY-MM-DD
-                file_date = datetime.strptime(date_str, "%Y-%m-%d")
+        # 汇总失败时抛出异常，不删除任何数据
+        last_expired = cutoff_date.strftime("%Y-%m-%d")
+        expired = sorted(date for date in list_available_dates(days=None) if date <= last_expired)
+        if not expired:
+            return
+        expired_data = load_daily_range(expired[0], expired[-1])
+        rollups.roll_up(expired_data[date] for date in sorted(expired_data))
 
-                # 删除过期文件
-                if file_date < cutoff_date:
-                    file_path.unlink()
+        if _use_sqlite():
+            conn = sqlite_store.connect()
+            try:
+                # 与汇总使用同一个边界：汇总过的日期才删除
+                sqlite_store.delete_through(conn, last_expired)
+            finally:
+                conn.close()
+            return
 
-            except (ValueError, OSError):
-                # 跳过无法解析的文件
+        # 旧 JSON 文件逐日删除；段文件删除过期日期的行，整月都过期时删除文件
+        current = _load_manifest()
+        files = {current["dates"][date]["file"] for date in expired}
+        for file_name in sorted(files):
+            if file_name.endswith(segments.SEGMENT_SUFFIX):
+                segments.prune(DATA_DIR / file_name, last_expired)
                 continue
+            try:
+                (DATA_DIR / file_name).unlink()
+            except FileNotFoundError:
+                pass
 
-    except Exception:
+        for date in expired:
+            del current["dates"][date]
+        manifest.save(current)
+
+    except Exception as e:
         # 清理失败不影响主流程
-        pass
+        print(f"    旧数据清理失败: {e}")
 
 
 def load_daily_data(date):
@@ -99,43 +284,148 @@ def load_daily_data(date):
     Returns:
         dict: 数据字典，如果文件不存在返回None
     """
-    file_path = DATA_DIR / f"{date}.json"
-
-    if not file_path.exists():
+    if _use_sqlite():
+        try:
+            conn = sqlite_store.connect()
+            try:
+                return sqlite_store.load_snapshot(conn, date, SOURCE_KEYS)
+            finally:
+                conn.close()
+        except sqlite3.Error:
+            return None
+
+    entry = _load_manifest()["dates"].get(date)
+    if entry is None:
         return None
 
+    if entry["file"].endswith(segments.SEGMENT_SUFFIX):
+        return segments.load(DATA_DIR, date)
+
+    # 迁移前的旧格式
     try:
-        with open(file_path, "r", encoding="utf-8") as f:
+        with open(DATA_DIR / entry["file"], "r", encoding="utf-8") as f:
             return json.load(f)
     except Exception:
         return None
 
 
+def load_daily_range(start=None, end=None):
+    """
+    加载日期范围内的所有数据，每个数据文件只读取一次
+
+    Args:
+        start: 开始日期（含），YYYY-MM-DD，None 表示不限
+        end: 结束日期（含），YYYY-MM-DD，None 表示不限
+
+    Returns:
+        dict: {date: 数据字典}，只包含有数据的日期
+    """
+    if _use_sqlite():
+        dates = [
+            date for date in list_available_dates(days=None)
+            if (start is None or date >= start) and (end is None or date <= end)
+        ]
+        loaded = {date: load_daily_data(date) for date in dates}
+        return {date: data for date, data in loaded.items() if data}
+
+    by_file = {}
+    for date, entry in _load_manifest()["dates"].items():
+        if (start is None or date >= start) and (end is None or date <= end):
+            by_file.setdefault(entry["file"], []).append(date)
+
+    results = {}
+    for file_name, dates in by_file.items():
+        if file_name.endswith(segments.SEGMENT_SUFFIX):
+            snapshots = segments.read_segment(DATA_DIR / file_name)
+            results.update((date, snapshots[date]) for date in dates if date in snapshots)
+            continue
+        try:
+            with open(DATA_DIR / file_name, "r", encoding="utf-8") as f:
+                results[dates[0]] = json.load(f)
+        except Exception:
+            continue
+    return results
+
+
 def list_available_dates(days=7):
     """
     列出最近N天有数据的日期
 
     Args:
-        days: 查询最近多少天
+        days: 查询最近多少天，None 表示全部
 
     Returns:
         list: 日期字符串列表，按日期降序排列
     """
-    if not DATA_DIR.exists():
-        return []
+    # cutoff 当天只有 00:00 之后才算在内（与早先按文件名解析日期时一致），即从下一天起
+    since = None
+    if days is not None:
+        since = (datetime.now() - timedelta(days=days - 1)).strftime("%Y-%m-%d")
+
+    if _use_sqlite():
+        conn = sqlite_store.connect()
+        try:
+            return sqlite_store.list_dates(conn, since=since)
+        finally:
+            conn.close()
+
+    return sorted(
+        (date for date in _load_manifest()["dates"] if since is None or date >= since),
+        reverse=True,
+    )
 
-    dates = []
-    cutoff_date = datetime.now() - timedelta(days=days)
 
-    for file_path in DATA_DIR.glob("*.json"):
+def load_known_names(source, days=28, before=None):
+    """
+    收集最近N天某个数据源出现过的名称，用于增量采集判断
+
+    Args:
+        source: 数据源 key，例如 "ai_tools"
+        days: 查询最近多少天
+        before: 只看该日期（不含）之前的数据，YYYY-MM-DD；
+            传入当天日期时同一天重复运行不会把当天已采集的工具当作已知
+
+    Returns:
+        set: 名称集合
+    """
+    if _use_sqlite():
+        since = (datetime.now() - timedelta(days=days - 1)).strftime("%Y-%m-%d")
+        conn = sqlite_store.connect()
         try:
-            date_str = file_path.stem
-            file_date = datetime.strptime(date_str, "%Y-%m-%d")
+            return sqlite_store.known_names(conn, source, since, before)
+        finally:
+            conn.close()
+
+    name_key = get_source(source)["name_key"]
+    names = set()
+    dates = [date for date in list_available_dates(days=days) if before is None or date < before]
+    if not dates:
+        return names
+    for data in load_daily_range(dates[-1], dates[0]).values():
+        for item in data.get(source, []):
+            if item.get(name_key):
+                names.add(item[name_key])
+    return names
+
+
+def query_items(source, start, end):
+    """
+    查询某个数据源在日期范围内的所有记录，只读取范围内的日期
 
-            if file_date >= cutoff_date:
-                dates.append(date_str)
+    Args:
+        source: 数据源 key，例如 "github_trending"
+        start: 开始日期（含），YYYY-MM-DD
+        end: 结束日期（含），YYYY-MM-DD
 
-        except ValueError:
-            continue
+    Returns:
+        list: [(date, item)]，按日期升序
+    """
+    if _use_sqlite():
+        conn = sqlite_store.connect()
+        try:
+            return sqlite_store.query_items(conn, source, start, end)
+        finally:
+            conn.close()
 
-    return sorted(dates, reverse=True)
+    loaded = load_daily_range(start, end)
+    return [(date, item) for date in sorted(loaded) for item in loaded[date].get(source, [])]
@@ -0,0 +1,94 @@
+"""数据集清单 - data/manifest.json 记录每个日期的存储位置、大小、内容哈希和各数据源条数
+
+每次保存时原子更新（写临时文件后替换），列出日期、按范围加载和完整性检查
+只需读取这一个文件，不再遍历目录、解析文件名或逐日探测文件是否存在。
+
+    {
+        "version": 1,
+        "dates": {
+            "2026-03-17": {
+                "file": "2026-03.jsonl",       # data/daily 下的文件
+                "bytes": 9178,                 # 该日快照的字节数
+                "sha256": "...",               # 该日快照内容的哈希
+                "counts": {"product_hunt": 5, ...},
+                "schema_version": 1
+            }
+        }
+    }
+"""
+
+import hashlib
+import json
+from pathlib import Path
+
+
+MANIFEST_PATH = Path(__file__).parent.parent / "data" / "manifest.json"
+
+# 清单文件本身的格式版本
+MANIFEST_VERSION = 1
+
+
+def empty():
+    return {"version": MANIFEST_VERSION, "dates": {}}
+
+
+def load(path=MANIFEST_PATH):
+    """读取清单，不存在、损坏或版本不符时返回 None"""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if manifest.get("version") != MANIFEST_VERSION:
+        return None
+    return manifest
+
+
+def save(manifest, path=MANIFEST_PATH):
+    """原子写入清单"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2, sort_keys=True)
+    tmp_path.replace(path)
+
+
+def make_entry(file_name, content, counts, schema_version):
+    """
+    生成一个日期的清单条目
+
+    Args:
+        file_name: data/daily 下的文件名
+        content: 该日快照的原始字节（段文件中的一行或整个 JSON 文件）
+        counts: {source: 条数}
+        schema_version: 快照结构版本
+    """
+    return {
+        "file": file_name,
+        "bytes": len(content),
+        "sha256": hashlib.sha256(content).hexdigest(),
+        "counts": counts,
+        "schema_version": schema_version,
+    }
+
+
+def verify(manifest, read_content):
+    """
+    完整性检查
+
+    Args:
+        manifest: 清单
+        read_content: read_content(date, entry) 返回该日快照当前的原始字节，不存在时返回 None
+
+    Returns:
+        list: 问题描述列表，为空表示全部一致
+    """
+    problems = []
+    for date, entry in sorted(manifest["dates"].items()):
+        content = read_content(date, entry)
+        if content is None:
+            problems.append(f"{date}: {entry['file']} 中找不到数据")
+        elif len(content) != entry["bytes"] or hashlib.sha256(content).hexdigest() != entry["sha256"]:
+            problems.append(f"{date}: {entry['file']} 内容与清单不一致")
+    return problems
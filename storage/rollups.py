@@ -0,0 +1,171 @@
+"""分层保留 - 超过保留期的每日快照在删除前压缩为周/月汇总
+
+    data/rollups/weekly/YYYY-Www.json    ISO 周
+    data/rollups/monthly/YYYY-MM.json
+
+每个汇总文件按数据源记录每个条目的出现次数、首次/最后出现日期，以及关键词计数；
+"dates" 记录已汇总的日期，重复汇总同一天不会重复计数。
+季度、年度的趋势分析读取少量汇总文件即可，不需要原始每日数据。
+"""
+
+import json
+from datetime import datetime
+from pathlib import Path
+
+from common.keywords import extract_keywords
+from common.sources import SOURCE_KEYS, get_source
+
+
+ROLLUP_DIR = Path(__file__).parent.parent / "data" / "rollups"
+
+# 汇总粒度
+KINDS = ("weekly", "monthly")
+
+# 每个数据源在一个汇总周期内保留的关键词数
+KEYWORD_LIMIT = 200
+
+
+def period_key(kind, date):
+    """日期所属的汇总周期，例如 weekly -> "2026-W12"，monthly -> "2026-03" """
+    day = datetime.strptime(date, "%Y-%m-%d")
+    if kind == "weekly":
+        year, week, _ = day.isocalendar()
+        return f"{year}-W{week:02d}"
+    return day.strftime("%Y-%m")
+
+
+def _path(kind, key):
+    return ROLLUP_DIR / kind / f"{key}.json"
+
+
+def load_rollup(kind, key):
+    """读取一个汇总文件，不存在或损坏时返回空汇总"""
+    try:
+        with open(_path(kind, key), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {"period": key, "dates": [], "sources": {}}
+
+
+def _save_rollup(kind, rollup):
+    path = _path(kind, rollup["period"])
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(rollup, f, ensure_ascii=False, indent=2, sort_keys=True)
+    tmp_path.replace(path)
+
+
+def _add_snapshot(rollup, snapshot):
+    """把一天的快照计入汇总"""
+    date = snapshot["date"]
+    for source in SOURCE_KEYS:
+        records = snapshot.get(source) or []
+        if not records:
+            continue
+        name_key = get_source(source)["name_key"]
+        summary = rollup["sources"].setdefault(source, {"items": {}, "keywords": {}})
+
+        for record in records:
+            name = (record.get(name_key) or "").strip()
+            if not name:
+                continue
+            item = summary["items"].setdefault(name.lower(), {
+                "name": name,
+                "appearances": 0,
+                "first_seen": date,
+                "last_seen": date,
+            })
+            item["appearances"] += 1
+            item["first_seen"] = min(item["first_seen"], date)
+            item["last_seen"] = max(item["last_seen"], date)
+            link = record.get("link") or record.get("url")
+            if link:
+                item["link"] = link
+
+        keywords = summary["keywords"]
+        for word, count in extract_keywords(records, top_n=None):
+            keywords[word] = keywords.get(word, 0) + count
+        summary["keywords"] = dict(
+            sorted(keywords.items(), key=lambda kv: -kv[1])[:KEYWORD_LIMIT]
+        )
+
+    rollup["dates"] = sorted(set(rollup["dates"]) | {date})
+
+
+def roll_up(snapshots):
+    """
+    把快照计入对应的周、月汇总，已汇总过的日期跳过
+
+    Args:
+        snapshots: 可迭代的每日快照
+
+    Returns:
+        int: 新汇总的天数
+    """
+    pending = {}
+    count = 0
+    for snapshot in snapshots:
+        added = False
+        for kind in KINDS:
+            key = period_key(kind, snapshot["date"])
+            rollup = pending.get((kind, key))
+            if rollup is None:
+                rollup = pending[(kind, key)] = load_rollup(kind, key)
+            if snapshot["date"] in rollup["dates"]:
+                continue
+            _add_snapshot(rollup, snapshot)
+            added = True
+        count += added
+
+    for (kind, _), rollup in pending.items():
+        _save_rollup(kind, rollup)
+    return count
+
+
+def load_rollups(kind, start=None, end=None):
+    """
+    读取一段时间内的汇总文件
+
+    Args:
+        kind: "weekly" 或 "monthly"
+        start: 最早周期（含），例如 "2026-01" / "2026-W02"
+        end: 最晚周期（含）
+
+    Returns:
+        list: 汇总列表，按周期升序
+    """
+    rollups = []
+    for path in sorted((ROLLUP_DIR / kind).glob("*.json")):
+        key = path.stem
+        if (start and key < start) or (end and key > end):
+            continue
+        rollups.append(load_rollup(kind, key))
+    return rollups
+
+
+def merge_rollups(rollups):
+    """
+    合并多个汇总（例如一个季度的月汇总）
+
+    Returns:
+        dict: {"dates": [...], "sources": {source: {"items": {...}, "keywords": {...}}}}
+    """
+    merged = {"dates": [], "sources": {}}
+    dates = set()
+    for rollup in rollups:
+        dates.update(rollup["dates"])
+        for source, summary in rollup["sources"].items():
+            target = merged["sources"].setdefault(source, {"items": {}, "keywords": {}})
+            for key, item in summary["items"].items():
+                current = target["items"].get(key)
+                if current is None:
+                    target["items"][key] = dict(item)
+                    continue
+                current["appearances"] += item["appearances"]
+                current["first_seen"] = min(current["first_seen"], item["first_seen"])
+                current["last_seen"] = max(current["last_seen"], item["last_seen"])
+            for word, count in summary["keywords"].items():
+                target["keywords"][word] = target["keywords"].get(word, 0) + count
+    merged["dates"] = sorted(dates)
+    return merged
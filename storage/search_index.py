@@ -0,0 +1,187 @@
+"""全文搜索索引 - SQLite FTS5 倒排索引，覆盖所有已存储记录的名称/标题、标语和描述
+
+索引是可重建的派生数据，保存在 data/cache/search.db（不提交到仓库）：
+    - save_daily_data 每次保存后调用 index_snapshot() 增量更新（替换当天的记录），
+      并补录存储中有、索引中缺少的日期（索引新建或缓存丢失后）
+    - python -m storage reindex 从已存储的全部数据重建
+清理旧的每日数据不会删除索引中的记录，已清理日期的记录只在索引文件保留期间可搜索；
+索引丢失后只能从仍在存储中的日期（最近 28 天）重建。长期历史见 data/rollups/。
+查询入口见根目录 query.py。
+"""
+
+import sqlite3
+from pathlib import Path
+
+from common.sources import SOURCE_KEYS, get_source
+
+
+INDEX_PATH = Path(__file__).parent.parent / "data" / "cache" / "search.db"
+
+# docs 保存原文和日期/数据源，docs_fts 是以 docs 为外部内容的 FTS5 索引，触发器保持同步
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS docs (
+    id          INTEGER PRIMARY KEY,
+    date        TEXT NOT NULL,
+    source      TEXT NOT NULL,
+    name        TEXT,
+    tagline     TEXT,
+    description TEXT,
+    link        TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_docs_date ON docs (date);
+CREATE VIRTUAL TABLE IF NOT EXISTS docs_fts USING fts5(
+    name, tagline, description,
+    content='docs', content_rowid='id',
+    tokenize='porter unicode61'
+);
+CREATE TRIGGER IF NOT EXISTS docs_ai AFTER INSERT ON docs BEGIN
+    INSERT INTO docs_fts (rowid, name, tagline, description)
+    VALUES (new.id, new.name, new.tagline, new.description);
+END;
+CREATE TRIGGER IF NOT EXISTS docs_ad AFTER DELETE ON docs BEGIN
+    INSERT INTO docs_fts (docs_fts, rowid, name, tagline, description)
+    VALUES ('delete', old.id, old.name, old.tagline, old.description);
+END;
+"""
+
+# bm25 列权重：名称命中 > 标语 > 描述
+BM25_WEIGHTS = (10.0, 5.0, 1.0)
+
+
+def connect(path=None):
+    """打开索引并确保表、索引和触发器存在（SQLite 不支持 FTS5 时抛出 sqlite3.OperationalError）"""
+    path = Path(path or INDEX_PATH)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(path)
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def _text_fields(source):
+    """
+    按数据源的 schema 选择写入索引的字段
+
+    Returns:
+        tuple: (名称字段, 标语字段, 描述字段, 链接字段)，schema 中没有的为 None
+    """
+    meta = get_source(source)
+    schema = meta["schema"]
+
+    def pick(*fields):
+        return next((f for f in fields if f in schema), None)
+
+    return meta["name_key"], pick("tagline"), pick("description"), pick("link", "url")
+
+
+def _doc_rows(date, snapshot):
+    for source in SOURCE_KEYS:
+        name_key, tagline_key, description_key, link_key = _text_fields(source)
+        for item in snapshot.get(source) or []:
+            name = item.get(name_key)
+            link = item.get(link_key) if link_key else None
+            if not link and source == "github_trending" and name:
+                link = f"https://github.com/{name}"
+            yield (
+                date, source, name,
+                item.get(tagline_key) if tagline_key else None,
+                item.get(description_key) if description_key else None,
+                link,
+            )
+
+
+def index_snapshot(conn, snapshot):
+    """把一天的快照写入索引，替换该日期已有的记录"""
+    date = snapshot["date"]
+    with conn:
+        conn.execute("DELETE FROM docs WHERE date = ?", (date,))
+        conn.executemany(
+            "INSERT INTO docs (date, source, name, tagline, description, link) VALUES (?, ?, ?, ?, ?, ?)",
+            _doc_rows(date, snapshot),
+        )
+
+
+def indexed_dates(conn):
+    """索引中已有记录的日期集合"""
+    return {date for (date,) in conn.execute("SELECT DISTINCT date FROM docs")}
+
+
+def earliest_date(conn):
+    """索引中最早的日期，索引为空时返回 None"""
+    return conn.execute("SELECT MIN(date) FROM docs").fetchone()[0]
+
+
+def rebuild(conn, snapshots):
+    """
+    清空并从快照重建索引
+
+    Args:
+        snapshots: 可迭代的每日快照（与 JSON 文件格式相同）
+
+    Returns:
+        int: 写入的天数
+    """
+    count = 0
+    with conn:
+        conn.execute("DELETE FROM docs")
+        conn.execute("INSERT INTO docs_fts (docs_fts) VALUES ('rebuild')")
+    for snapshot in snapshots:
+        index_snapshot(conn, snapshot)
+        count += 1
+    with conn:
+        conn.execute("INSERT INTO docs_fts (docs_fts) VALUES ('optimize')")
+    return count
+
+
+def _quote_terms(query):
+    """把查询拆成词并逐个加引号，避免 - : * 等字符被当作 FTS5 语法"""
+    return " ".join('"{}"'.format(term.replace('"', '""')) for term in query.split())
+
+
+def search(conn, query, since=None, source=None, limit=20):
+    """
+    全文搜索，同一数据源中同名的记录合并为一条
+
+    Args:
+        query: FTS5 查询，例如 'voice agent'、'"voice agent"'、'voice OR speech'；
+            语法错误时按普通词（全部包含）重新查询
+        since: 最早日期（含），YYYY-MM-DD
+        source: 只搜索某个数据源
+        limit: 最多返回的条数
+
+    Returns:
+        list: [{"source", "name", "link", "first_seen", "last_seen", "appearances", "score"}]，
+            按 bm25 相关度排序（score 越小越相关）
+    """
+    # 命中结果先物化，bm25() 只能在 FTS 查询本身中计算，不能被展开到外层聚合里
+    sql = f"""
+        WITH hits AS MATERIALIZED (
+            SELECT docs.source, docs.name, docs.link, docs.date,
+                   bm25(docs_fts, {", ".join(str(w) for w in BM25_WEIGHTS)}) AS rank
+            FROM docs_fts JOIN docs ON docs.id = docs_fts.rowid
+            WHERE docs_fts MATCH ?
+              AND (? IS NULL OR docs.date >= ?)
+              AND (? IS NULL OR docs.source = ?)
+        )
+        SELECT source, name, link, MIN(date), MAX(date), COUNT(*), MIN(rank) AS best
+        FROM hits
+        GROUP BY source, lower(trim(name))
+        ORDER BY best
+        LIMIT ?
+    """
+    try:
+        rows = conn.execute(sql, (query, since, since, source, source, limit)).fetchall()
+    except sqlite3.OperationalError:
+        rows = conn.execute(sql, (_quote_terms(query), since, since, source, source, limit)).fetchall()
+
+    return [
+        {
+            "source": row[0],
+            "name": row[1],
+            "link": row[2],
+            "first_seen": row[3],
+            "last_seen": row[4],
+            "appearances": row[5],
+            "score": row[6],
+        }
+        for row in rows
+    ]
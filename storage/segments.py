@@ -0,0 +1,200 @@
+"""按月追加的 JSONL 快照段 - data/daily/YYYY-MM.jsonl，每行一天
+
+每行是一天的完整快照，紧凑编码（无缩进）且键按字母排序，相同数据总是得到相同的字节。
+每天只在当月文件末尾追加一行，git 中每次提交的增量只有新的一行，
+而不是一个新的整文件。同一日期重复保存时替换该日期的行（整体重写段文件）；
+读取时遇到重复日期以最后一行为准。清理旧数据时删除过期日期的行（prune），
+整月都过期后段文件被删除。
+"""
+
+import json
+from datetime import datetime
+from pathlib import Path
+
+
+SEGMENT_SUFFIX = ".jsonl"
+
+
+def segment_path(directory, date):
+    """日期所在的月度段文件"""
+    return Path(directory) / f"{date[:7]}{SEGMENT_SUFFIX}"
+
+
+def encode(snapshot):
+    """紧凑、稳定排序的单行编码"""
+    return json.dumps(snapshot, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+
+
+def save(directory, snapshot):
+    """
+    保存一天的快照：新日期追加到当月段文件末尾，
+    已有的日期则替换该行并重写段文件（先写临时文件再替换），其他日期的行保持原样
+
+    Returns:
+        str: 写入的行（不含换行符）
+    """
+    date = snapshot["date"]
+    path = segment_path(directory, date)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    line = encode(snapshot)
+
+    if find(directory, date)[0] is None:
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(line + "\n")
+        return line
+
+    lines = {day: text for day, (text, _) in read_lines(path).items()}
+    lines[date] = line
+    _write_lines(path, lines)
+    return line
+
+
+def read_lines(path):
+    """
+    读取整个段文件，保留每天的原始行
+
+    Returns:
+        dict: {date: (行文本（不含换行符）, snapshot)}，同一日期取最后一行；文件不存在时为空
+    """
+    lines = {}
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    snapshot = json.loads(line)
+                except ValueError:
+                    # 跳过写入中断的残行
+                    continue
+                lines[snapshot["date"]] = (line.rstrip("\n"), snapshot)
+    except OSError:
+        pass
+    return lines
+
+
+def read_segment(path):
+    """
+    读取整个段文件
+
+    Returns:
+        dict: {date: snapshot}，同一日期取最后一行；文件不存在时为空
+    """
+    return {date: snapshot for date, (_, snapshot) in read_lines(path).items()}
+
+
+def find(directory, date):
+    """
+    查找某一天的最后一行
+
+    Returns:
+        tuple: (行文本（不含换行符）, snapshot)，不存在时为 (None, None)
+    """
+    marker = f'"date":"{date}"'
+    found = (None, None)
+    try:
+        with open(segment_path(directory, date), "r", encoding="utf-8") as f:
+            for line in f:
+                # 先做子串过滤，只解析可能匹配的行
+                if marker not in line:
+                    continue
+                try:
+                    snapshot = json.loads(line)
+                except ValueError:
+                    continue
+                if snapshot.get("date") == date:
+                    found = (line.rstrip("\n"), snapshot)
+    except OSError:
+        pass
+    return found
+
+
+def load(directory, date):
+    """读取某一天的快照，不存在时返回 None"""
+    return find(directory, date)[1]
+
+
+def list_dates(directory):
+    """所有段文件中的日期集合"""
+    dates = set()
+    for path in Path(directory).glob(f"*{SEGMENT_SUFFIX}"):
+        dates.update(read_segment(path))
+    return dates
+
+
+def _write_lines(path, lines):
+    """按日期顺序把 {date: 行文本} 写成段文件，先写临时文件再替换"""
+    path = Path(path)
+    tmp_path = path.with_suffix(".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        for date in sorted(lines):
+            f.write(lines[date] + "\n")
+    tmp_path.replace(path)
+
+
+def write_segment(path, snapshots):
+    """按日期顺序重写整个段文件（迁移用）"""
+    _write_lines(path, {date: encode(snapshot) for date, snapshot in snapshots.items()})
+
+
+def prune(path, last_date):
+    """
+    删除段文件中 last_date（含）之前的行，其他行保持原样；不剩任何行时删除文件
+
+    Returns:
+        list: 删除的日期
+    """
+    lines = read_lines(path)
+    removed = sorted(date for date in lines if date <= last_date)
+    if not removed:
+        return []
+    kept = {date: text for date, (text, _) in lines.items() if date > last_date}
+    if kept:
+        _write_lines(path, kept)
+    else:
+        Path(path).unlink()
+    return removed
+
+
+def migrate(directory, keep=False):
+    """
+    把旧的每日 JSON 文件（YYYY-MM-DD.json）合并进月度段文件
+
+    段文件中已有的日期保留段文件中的版本（比旧文件更新）。
+
+    Args:
+        directory: 数据目录
+        keep: 是否保留旧文件
+
+    Returns:
+        tuple: (迁移的天数, 迁移前字节数, 迁移后段文件字节数)
+    """
+    directory = Path(directory)
+    legacy = {}
+    for file_path in sorted(directory.glob("*.json")):
+        try:
+            datetime.strptime(file_path.stem, "%Y-%m-%d")
+            with open(file_path, "r", encoding="utf-8") as f:
+                legacy[file_path] = json.load(f)
+        except (ValueError, OSError):
+            continue
+
+    by_month = {}
+    for file_path, snapshot in legacy.items():
+        snapshot.setdefault("date", file_path.stem)
+        by_month.setdefault(snapshot["date"][:7], {})[snapshot["date"]] = snapshot
+
+    bytes_before = sum(p.stat().st_size for p in legacy) + sum(
+        p.stat().st_size for p in directory.glob(f"*{SEGMENT_SUFFIX}")
+    )
+
+    for month, snapshots in by_month.items():
+        path = directory / f"{month}{SEGMENT_SUFFIX}"
+        merged = dict(snapshots)
+        merged.update(read_segment(path))
+        write_segment(path, merged)
+
+    if not keep:
+        for file_path in legacy:
+            file_path.unlink()
+
+    bytes_after = sum(p.stat().st_size for p in directory.glob(f"*{SEGMENT_SUFFIX}"))
+    return len(legacy), bytes_before, bytes_after
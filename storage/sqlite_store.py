@@ -0,0 +1,179 @@
+"""SQLite 快照存储 - 每条记录一行，按日期、数据源、规范化名称建索引
+
+由 data_store 在 STORAGE_BACKEND=sqlite 时使用，对外接口不变。
+按数据源和日期范围查询时只读取命中的行，不会反序列化无关日期的数据。
+
+导入已有的 JSON 文件和 JSONL 段文件：
+    python -m storage import            # 导入 data/daily/ 中的数据
+    python -m storage import --dir DIR
+"""
+
+import json
+import sqlite3
+from pathlib import Path
+
+from common.sources import get_source
+
+from . import segments
+
+
+# 数据库文件
+DB_PATH = Path(__file__).parent.parent / "data" / "trends.db"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS snapshots (
+    date      TEXT PRIMARY KEY,
+    timestamp TEXT
+);
+CREATE TABLE IF NOT EXISTS items (
+    id        INTEGER PRIMARY KEY,
+    date      TEXT NOT NULL,
+    source    TEXT NOT NULL,
+    position  INTEGER NOT NULL,
+    name      TEXT,
+    name_norm TEXT,
+    data      TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_items_date ON items (date);
+CREATE INDEX IF NOT EXISTS idx_items_source_date ON items (source, date);
+CREATE INDEX IF NOT EXISTS idx_items_source_name ON items (source, name_norm);
+"""
+
+
+def normalize_name(name):
+    """规范化名称（去首尾空白、小写），与 weekly_analyzer 的频次统计一致"""
+    return (name or "").strip().lower()
+
+
+def connect(path=None):
+    """打开数据库并确保表和索引存在"""
+    path = Path(path or DB_PATH)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(path)
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def _item_rows(date, data, source_keys):
+    for source in source_keys:
+        name_key = get_source(source)["name_key"]
+        for position, item in enumerate(data.get(source) or []):
+            name = item.get(name_key)
+            yield (
+                date, source, position, name, normalize_name(name),
+                json.dumps(item, ensure_ascii=False, sort_keys=True),
+            )
+
+
+def save_snapshot(conn, snapshot, source_keys):
+    """
+    写入一天的快照，同一日期已有的数据会被替换
+
+    Args:
+        conn: 数据库连接
+        snapshot: {"date", "timestamp", <source>: [...]}，与 JSON 文件格式相同
+        source_keys: 要写入的数据源 key 列表
+    """
+    date = snapshot["date"]
+    with conn:
+        conn.execute("DELETE FROM items WHERE date = ?", (date,))
+        conn.execute(
+            "INSERT OR REPLACE INTO snapshots (date, timestamp) VALUES (?, ?)",
+            (date, snapshot.get("timestamp")),
+        )
+        conn.executemany(
+            "INSERT INTO items (date, source, position, name, name_norm, data) VALUES (?, ?, ?, ?, ?, ?)",
+            _item_rows(date, snapshot, source_keys),
+        )
+
+
+def load_snapshot(conn, date, source_keys):
+    """
+    读取一天的快照
+
+    Returns:
+        dict: 与 JSON 文件格式相同，日期不存在时返回 None
+    """
+    row = conn.execute("SELECT timestamp FROM snapshots WHERE date = ?", (date,)).fetchone()
+    if row is None:
+        return None
+
+    snapshot = {"date": date, "timestamp": row[0]}
+    for source in source_keys:
+        snapshot[source] = []
+    for source, data in conn.execute(
+        "SELECT source, data FROM items WHERE date = ? ORDER BY source, position", (date,)
+    ):
+        snapshot.setdefault(source, []).append(json.loads(data))
+    return snapshot
+
+
+def list_dates(conn, since=None):
+    """列出有数据的日期（降序），since 为最早日期（含）"""
+    if since is None:
+        rows = conn.execute("SELECT date FROM snapshots ORDER BY date DESC")
+    else:
+        rows = conn.execute("SELECT date FROM snapshots WHERE date >= ? ORDER BY date DESC", (since,))
+    return [date for (date,) in rows]
+
+
+def query_items(conn, source, start, end):
+    """
+    查询某个数据源在日期范围内的所有记录
+
+    Args:
+        source: 数据源 key
+        start: 开始日期（含），YYYY-MM-DD
+        end: 结束日期（含），YYYY-MM-DD
+
+    Returns:
+        list: [(date, item)]，按日期、榜单位置升序
+    """
+    rows = conn.execute(
+        "SELECT date, data FROM items WHERE source = ? AND date BETWEEN ? AND ? ORDER BY date, position",
+        (source, start, end),
+    )
+    return [(date, json.loads(data)) for date, data in rows]
+
+
+def known_names(conn, source, since, before=None):
+    """某个数据源从 since（含）到 before（不含）出现过的名称集合，只读取名称列"""
+    rows = conn.execute(
+        "SELECT DISTINCT name FROM items WHERE source = ? AND date >= ? AND (? IS NULL OR date < ?)"
+        " AND name IS NOT NULL",
+        (source, since, before, before),
+    )
+    return {name for (name,) in rows if name}
+
+
+def delete_through(conn, date):
+    """删除 date 及之前（含）的所有数据"""
+    with conn:
+        conn.execute("DELETE FROM items WHERE date <= ?", (date,))
+        conn.execute("DELETE FROM snapshots WHERE date <= ?", (date,))
+
+
+def import_json_dir(conn, directory, source_keys):
+    """
+    批量导入每日 JSON 文件和月度 JSONL 段文件，已存在的日期会被覆盖
+
+    Returns:
+        int: 导入的天数
+    """
+    count = 0
+    for file_path in sorted(Path(directory).glob("*.json")):
+        try:
+            with open(file_path, "r", encoding="utf-8") as f:
+                snapshot = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"    跳过 {file_path.name}: {e}")
+            continue
+        snapshot.setdefault("date", file_path.stem)
+        save_snapshot(conn, snapshot, source_keys)
+        count += 1
+
+    for file_path in sorted(Path(directory).glob(f"*{segments.SEGMENT_SUFFIX}")):
+        for snapshot in segments.read_segment(file_path).values():
+            save_snapshot(conn, snapshot, source_keys)
+            count += 1
+    return count